@@ -31,21 +31,43 @@ def classify_health(ndvi_path: str, weather_data: dict = None) -> dict:
     """
     import rasterio
 
-    with rasterio.open(str(ndvi_path)) as src:
-        ndvi = src.read(1)
+    # Stream the raster block by block so peak memory stays at one tile,
+    # with GDAL's block cache bounded for long-running dashboard sessions.
+    running = None
+    with rasterio.Env(GDAL_CACHEMAX=64, VSI_CACHE=True):
+        with rasterio.open(ndvi_path, sharing=False) as src:
+            for _, window in src.block_windows(1):
+                tile = src.read(1, window=window, out_dtype="float32")
+                running = _merge_stats(running, _ndvi_stats(
+                    tile, config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY
+                ))
 
-    valid = ndvi[ndvi > -9999]
+    return _build_classification(running, str(ndvi_path), weather_data)
 
-    # Per-class pixel counts
-    healthy = (valid > config.NDVI_HEALTHY).sum()
-    moderate = ((valid > config.NDVI_MODERATE) & (valid <= config.NDVI_HEALTHY)).sum()
-    severe = ((valid > config.NDVI_SEVERE) & (valid <= config.NDVI_MODERATE)).sum()
-    critical = (valid <= config.NDVI_SEVERE).sum()
-    total = valid.size
+
+def classify_health_array(ndvi: np.ndarray, weather_data: dict = None,
+                          source_file: str = "") -> dict:
+    """
+    Classify overall field health from an NDVI band already in memory.
+
+    Same output as ``classify_health``, for callers that have read the
+    raster once and share it with other analyses.
+    """
+    running = _ndvi_stats(
+        ndvi.astype(np.float32, copy=False),
+        config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY,
+    )
+    return _build_classification(running, source_file, weather_data)
+
+
+def _build_classification(running: tuple, source_file: str, weather_data: dict) -> dict:
+    """Assemble the classification dict from merged NDVI statistics."""
+    (critical, severe, moderate, healthy, total,
+     ndvi_mean, ndvi_std, ndvi_min, ndvi_max) = _finalize_stats(running)
 
     classification = {
         "timestamp": datetime.utcnow().isoformat(),
-        "source_file": str(ndvi_path),
+        "source_file": source_file,
         "pixel_counts": {
             "healthy": int(healthy),
             "moderate_stress": int(moderate),
@@ -60,10 +82,10 @@ def classify_health(ndvi_path: str, weather_data: dict = None) -> dict:
             "critical": round(critical / total * 100, 1) if total > 0 else 0,
         },
         "overall_ndvi": {
-            "mean": float(np.mean(valid)),
-            "std": float(np.std(valid)),
-            "min": float(np.min(valid)),
-            "max": float(np.max(valid)),
+            "mean": ndvi_mean,
+            "std": ndvi_std,
+            "min": ndvi_min,
+            "max": ndvi_max,
         },
         "overall_health": _overall_health(healthy, moderate, severe, critical, total),
         "alerts": [],
@@ -86,6 +108,66 @@ def classify_health(ndvi_path: str, weather_data: dict = None) -> dict:
     return classification
 
 
+def _ndvi_stats(ndvi: np.ndarray, sev: float, mod: float, hlt: float) -> tuple:
+    """
+    Bucket and summarize the valid NDVI pixels of one tile without compacting them.
+
+    A single searchsorted pass assigns every pixel to nodata (-9999 or
+    NaN) / critical / severe / moderate / healthy, and the moments are
+    reduced in place with ``where=`` so no filtered copy of the tile is
+    allocated.
+
+    Returns:
+        (critical, severe, moderate, healthy, total, mean, m2, min, max)
+        where ``m2`` is the sum of squared deviations from the tile mean.
+    """
+    flat = ndvi.ravel()
+    edges = np.array([-9999, sev, mod, hlt], dtype=flat.dtype)
+    bucket = np.searchsorted(edges, flat, side="left")
+    # NaN sorts past every edge, into healthy; it is nodata like -9999.
+    # min() is NaN only if some pixel is, so clean tiles skip the mask.
+    if np.isnan(flat.min()):
+        bucket[np.isnan(flat)] = 0
+    counts = np.bincount(bucket, minlength=5)
+    critical, severe, moderate, healthy = (int(c) for c in counts[1:])
+    total = critical + severe + moderate + healthy
+    if total == 0:
+        return critical, severe, moderate, healthy, 0, 0.0, 0.0, np.inf, -np.inf
+
+    valid = bucket > 0
+    mean = float(np.mean(flat, where=valid, dtype=np.float64))
+    m2 = float(np.var(flat, where=valid, dtype=np.float64)) * total
+    vmin = float(np.min(flat, where=valid, initial=np.inf))
+    vmax = float(np.max(flat, where=valid, initial=-np.inf))
+    return critical, severe, moderate, healthy, total, mean, m2, vmin, vmax
+
+
+def _merge_stats(a: tuple, b: tuple) -> tuple:
+    """Combine two tile summaries (Chan et al. parallel variant of Welford)."""
+    if a is None:
+        return b
+    n_a, n_b = a[4], b[4]
+    n = n_a + n_b
+    counts = tuple(x + y for x, y in zip(a[:4], b[:4]))
+    if n_b == 0:
+        return counts + a[4:]
+    if n_a == 0:
+        return counts + b[4:]
+    delta = b[5] - a[5]
+    mean = a[5] + delta * n_b / n
+    m2 = a[6] + b[6] + delta * delta * n_a * n_b / n
+    return counts + (n, mean, m2, min(a[7], b[7]), max(a[8], b[8]))
+
+
+def _finalize_stats(running: tuple) -> tuple:
+    """Turn a merged summary into (counts..., total, mean, std, min, max)."""
+    if running is None or running[4] == 0:
+        counts = running[:4] if running else (0, 0, 0, 0)
+        return counts + (0, 0.0, 0.0, 0.0, 0.0)
+    critical, severe, moderate, healthy, total, mean, m2, vmin, vmax = running
+    return critical, severe, moderate, healthy, total, mean, float(np.sqrt(m2 / total)), vmin, vmax
+
+
 def _overall_health(healthy, moderate, severe, critical, total) -> str:
     """Determine overall field health label."""
     if total == 0:
@@ -18,8 +18,12 @@ logger = logging.getLogger(__name__)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 
+# Health classes and map colors, ordered from lowest to highest NDVI
+_HEALTH_CLASSES = np.array(["Critical", "Severe Stress", "Moderate Stress", "Healthy"])
+_HEALTH_COLORS = np.array(["#8e44ad", "#e74c3c", "#f39c12", "#2ecc71"])
 
-def segment_plots(ndvi_path: str, min_plot_area: int = 100) -> dict:
+
+def segment_plots(ndvi_path: str, min_plot_area: int = 100, scale: int = None) -> dict:
     """
     Segment individual crop plots from an NDVI image.
 
@@ -29,77 +33,159 @@ def segment_plots(ndvi_path: str, min_plot_area: int = 100) -> dict:
     Args:
         ndvi_path: Path to NDVI GeoTIFF.
         min_plot_area: Minimum plot size in pixels.
+        scale: Block size the NDVI is averaged down by before masking and
+            labelling (defaults to config.SEGMENTATION_SCALE). Plot
+            statistics are still computed at full resolution.
 
     Returns:
         dict with plot geometries and statistics.
     """
     import rasterio
+
+    # Bounded GDAL cache and an unshared handle, as in classify_health, so
+    # repeated dashboard runs don't grow the process's block cache.
+    with rasterio.Env(GDAL_CACHEMAX=64, VSI_CACHE=True):
+        with rasterio.open(ndvi_path, sharing=False) as src:
+            ndvi = src.read(1, out_dtype="float32")
+            transform = src.transform
+            crs = str(src.crs)
+
+    return segment_plots_array(
+        ndvi, transform, crs, min_plot_area, scale, source_file=str(ndvi_path)
+    )
+
+
+def segment_plots_array(ndvi: np.ndarray, transform, crs: str, min_plot_area: int = 100,
+                        scale: int = None, source_file: str = "") -> dict:
+    """
+    Segment crop plots from an NDVI band already in memory.
+
+    Same output as ``segment_plots``; ``transform`` and ``crs`` are the
+    raster's affine transform and CRS string.
+    """
+    import rasterio
     from scipy import ndimage
-    from skimage.morphology import opening, closing, disk
-    from skimage.measure import regionprops, label
+    from skimage.morphology import convex_hull_image, disk
 
-    with rasterio.open(str(ndvi_path)) as src:
-        ndvi = src.read(1)
-        transform = src.transform
-        crs = str(src.crs)
+    # Plot boundaries are oversampled at 10 m, so mask and label a
+    # block-averaged grid; the structuring element shrinks to match.
+    if scale is None:
+        scale = config.SEGMENTATION_SCALE
+    scale = max(1, int(scale))
+    coarse = _block_mean(ndvi, scale) if scale > 1 else ndvi
 
     # Create vegetation mask (NDVI > threshold for any vegetation)
-    veg_mask = (ndvi > config.NDVI_SEVERE).astype(np.uint8)
+    veg_mask = coarse > config.NDVI_SEVERE
 
-    # Morphological cleaning
-    selem = disk(3)
-    cleaned = closing(opening(veg_mask, selem), selem)
+    # Morphological cleaning (binary opening then closing). Erosions treat
+    # the image border as vegetation so edge plots are not eaten away.
+    # Sparse fields only clean the vegetation bounding box: with a margin
+    # wider than the closing can reach, the result is identical.
+    radius = max(1, round(3 / scale))
+    selem = disk(radius)
+    cleaned = np.zeros_like(veg_mask)
+    rows = np.flatnonzero(veg_mask.any(axis=1))
+    cols = np.flatnonzero(veg_mask.any(axis=0))
+    if rows.size:
+        margin = 2 * radius + 1
+        fg = (
+            slice(max(rows[0] - margin, 0), rows[-1] + 1 + margin),
+            slice(max(cols[0] - margin, 0), cols[-1] + 1 + margin),
+        )
+        opened = ndimage.binary_dilation(
+            ndimage.binary_erosion(veg_mask[fg], selem, border_value=1), selem
+        )
+        cleaned[fg] = ndimage.binary_erosion(
+            ndimage.binary_dilation(opened, selem), selem, border_value=1
+        )
+        # Nodata (and NaN) is never part of a plot, though the closing may
+        # bridge it, e.g. a nodata strip between edge plots and the border
+        cleaned &= coarse > -9999
 
-    # Label connected components
-    labeled, n_features = ndimage.label(cleaned)
+    # Label connected components inside the foreground bounding box only,
+    # so sparse masks don't pay for scanning empty background.
+    labeled = np.zeros(cleaned.shape, dtype=np.int32)
+    rows = np.flatnonzero(cleaned.any(axis=1))
+    cols = np.flatnonzero(cleaned.any(axis=0))
+    n_features = 0
+    if rows.size:
+        window = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        n_features = ndimage.label(cleaned[window], output=labeled[window])
 
-    # Extract region properties
-    regions = regionprops(labeled, intensity_image=ndvi)
+    if scale > 1:
+        # Back to full resolution for the per-plot statistics
+        height, width = ndvi.shape
+        labeled = np.repeat(np.repeat(labeled, scale, axis=0), scale, axis=1)[:height, :width]
+        # Blocks that were partly nodata only keep their valid pixels
+        if not ndvi.min() > -9999:
+            labeled[~(ndvi > -9999)] = 0
+        if rows.size:
+            window = (
+                slice(rows[0] * scale, min((rows[-1] + 1) * scale, height)),
+                slice(cols[0] * scale, min((cols[-1] + 1) * scale, width)),
+            )
 
     plots = []
-    for region in regions:
-        if region.area < min_plot_area:
-            continue
-
-        # Get bounding box in pixel coordinates
-        minr, minc, maxr, maxc = region.bbox
-
-        # Convert to geo coordinates
-        geo_min = rasterio.transform.xy(transform, maxr, minc, offset="center")
-        geo_max = rasterio.transform.xy(transform, minr, maxc, offset="center")
-
-        # Health classification based on mean NDVI
-        mean_ndvi = region.mean_intensity
-        health_class = _classify_ndvi(mean_ndvi)
-
-        plot = {
-            "id": int(region.label),
-            "area_pixels": int(region.area),
-            "bbox_geo": {
-                "south": geo_min[1] if isinstance(geo_min, tuple) else geo_min,
-                "west": geo_min[0] if isinstance(geo_min, tuple) else geo_min,
-                "north": geo_max[1] if isinstance(geo_max, tuple) else geo_max,
-                "east": geo_max[0] if isinstance(geo_max, tuple) else geo_max,
-            },
-            "centroid_pixel": {
-                "row": int(region.centroid[0]),
-                "col": int(region.centroid[1]),
-            },
-            "ndvi_stats": {
-                "mean": float(mean_ndvi),
-                "min": float(region.min_intensity),
-                "max": float(region.max_intensity),
-            },
-            "health_class": health_class["class"],
-            "health_color": health_class["color"],
-            "eccentricity": float(region.eccentricity),
-            "solidity": float(region.solidity),
-        }
-        plots.append(plot)
+    if n_features:
+        # Region properties for every label at once instead of per-region
+        # attribute lookups; only solidity still needs a per-plot hull.
+        sub = labeled[window]
+        index = np.arange(1, n_features + 1)
+        areas, centroids, eccentricity = _region_moments(sub, n_features)
+        means = ndimage.mean(ndvi[window], sub, index)
+        mins = ndimage.minimum(ndvi[window], sub, index)
+        maxs = ndimage.maximum(ndvi[window], sub, index)
+        slices = ndimage.find_objects(sub)
+        row0, col0 = window[0].start, window[1].start
+
+        # Health classification based on mean NDVI, for all plots at once
+        keep = np.flatnonzero(areas >= min_plot_area)
+        health = _health_index(means[keep])
+        health_classes = _HEALTH_CLASSES[health].tolist()
+        health_colors = _HEALTH_COLORS[health].tolist()
+
+        for i, health_class, health_color in zip(keep, health_classes, health_colors):
+            row_slice, col_slice = slices[i]
+
+            # Get bounding box in pixel coordinates
+            minr, maxr = row0 + row_slice.start, row0 + row_slice.stop
+            minc, maxc = col0 + col_slice.start, col0 + col_slice.stop
+
+            # Convert to geo coordinates
+            geo_min = rasterio.transform.xy(transform, maxr, minc, offset="center")
+            geo_max = rasterio.transform.xy(transform, minr, maxc, offset="center")
+
+            mean_ndvi = means[i]
+            hull = convex_hull_image(sub[slices[i]] == i + 1)
+
+            plot = {
+                "id": int(i + 1),
+                "area_pixels": int(areas[i]),
+                "bbox_geo": {
+                    "south": geo_min[1] if isinstance(geo_min, tuple) else geo_min,
+                    "west": geo_min[0] if isinstance(geo_min, tuple) else geo_min,
+                    "north": geo_max[1] if isinstance(geo_max, tuple) else geo_max,
+                    "east": geo_max[0] if isinstance(geo_max, tuple) else geo_max,
+                },
+                "centroid_pixel": {
+                    "row": int(row0 + centroids[0][i]),
+                    "col": int(col0 + centroids[1][i]),
+                },
+                "ndvi_stats": {
+                    "mean": float(mean_ndvi),
+                    "min": float(mins[i]),
+                    "max": float(maxs[i]),
+                },
+                "health_class": health_class,
+                "health_color": health_color,
+                "eccentricity": float(eccentricity[i]),
+                "solidity": float(areas[i] / np.count_nonzero(hull)),
+            }
+            plots.append(plot)
 
     result = {
         "timestamp": datetime.utcnow().isoformat(),
-        "source_file": str(ndvi_path),
+        "source_file": source_file,
         "crs": crs,
         "total_plots": len(plots),
         "plots": plots,
@@ -107,20 +193,79 @@ def segment_plots(ndvi_path: str, min_plot_area: int = 100) -> dict:
         "segmentation_mask_shape": list(labeled.shape),
     }
 
-    logger.info(f"Segmented {len(plots)} crop plots from {ndvi_path}")
+    logger.info(f"Segmented {len(plots)} crop plots from {source_file}")
     return result
 
 
+def _block_mean(arr: np.ndarray, scale: int) -> np.ndarray:
+    """
+    Average ``scale`` x ``scale`` blocks over their valid pixels, edge-padding
+    partial blocks. Nodata (-9999, as calculate_ndvi writes it) and NaN are
+    left out, so they cannot drag vegetation beside them below the mask
+    threshold; a block with no valid pixel stays -9999.
+    """
+    height, width = arr.shape
+    padded = np.pad(arr, ((0, -height % scale), (0, -width % scale)), mode="edge")
+    shape = (padded.shape[0] // scale, scale, padded.shape[1] // scale, scale)
+    # min() is NaN, and fails the test, if any pixel is
+    if padded.min() > -9999:
+        return padded.reshape(shape).mean(axis=(1, 3), dtype=np.float64).astype(arr.dtype)
+    valid = padded > -9999
+    sums = np.where(valid, padded, 0).reshape(shape).sum(axis=(1, 3), dtype=np.float64)
+    counts = valid.reshape(shape).sum(axis=(1, 3))
+    means = np.full(sums.shape, -9999, dtype=np.float64)
+    np.divide(sums, counts, out=means, where=counts > 0)
+    return means.astype(arr.dtype)
+
+
+def _region_moments(labels: np.ndarray, n: int) -> tuple:
+    """
+    Area, centroid and eccentricity for labels 1..n from pixel moments.
+
+    Eccentricity follows skimage's definition (from the eigenvalues of the
+    region's inertia tensor) so values match ``regionprops``.
+    """
+    flat = labels.ravel()
+    rr, cc = np.indices(labels.shape, dtype=np.float64)
+    rr, cc = rr.ravel(), cc.ravel()
+
+    def _sum(weights):
+        return np.bincount(flat, weights=weights, minlength=n + 1)[1:]
+
+    areas = np.bincount(flat, minlength=n + 1)[1:]
+    mean_r = _sum(rr) / areas
+    mean_c = _sum(cc) / areas
+
+    # Central second moments, centred per label for numerical stability
+    dr = rr - np.concatenate(([0.0], mean_r))[flat]
+    dc = cc - np.concatenate(([0.0], mean_c))[flat]
+    var_r = _sum(dr * dr) / areas
+    var_c = _sum(dc * dc) / areas
+    cov = _sum(dr * dc) / areas
+
+    half_trace = (var_r + var_c) / 2
+    spread = np.sqrt(((var_r - var_c) / 2) ** 2 + cov ** 2)
+    l1 = half_trace + spread
+    l2 = np.clip(half_trace - spread, 0, None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eccentricity = np.where(l1 > 0, np.sqrt(1 - l2 / l1), 0.0)
+
+    return areas, (mean_r, mean_c), eccentricity
+
+
+def _health_index(ndvi_values):
+    """
+    Index into the health LUTs for NDVI value(s): the number of class
+    thresholds each value is strictly above.
+    """
+    thresholds = [config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY]
+    return np.searchsorted(thresholds, ndvi_values, side="left")
+
+
 def _classify_ndvi(ndvi_value: float) -> dict:
     """Classify a single NDVI value into a health category."""
-    if ndvi_value > config.NDVI_HEALTHY:
-        return {"class": "Healthy", "color": "#2ecc71"}
-    elif ndvi_value > config.NDVI_MODERATE:
-        return {"class": "Moderate Stress", "color": "#f39c12"}
-    elif ndvi_value > config.NDVI_SEVERE:
-        return {"class": "Severe Stress", "color": "#e74c3c"}
-    else:
-        return {"class": "Critical", "color": "#8e44ad"}
+    idx = _health_index(ndvi_value)
+    return {"class": str(_HEALTH_CLASSES[idx]), "color": str(_HEALTH_COLORS[idx])}
 
 
 def _summarize_plots(plots: list) -> dict:
@@ -128,17 +273,24 @@ def _summarize_plots(plots: list) -> dict:
     if not plots:
         return {"total": 0}
 
-    classes = [p["health_class"] for p in plots]
-    ndvi_values = [p["ndvi_stats"]["mean"] for p in plots]
+    class_index = {name: i for i, name in enumerate(_HEALTH_CLASSES.tolist())}
+    idx = np.fromiter(
+        (class_index[p["health_class"]] for p in plots), dtype=np.intp, count=len(plots)
+    )
+    ndvi_values = np.fromiter(
+        (p["ndvi_stats"]["mean"] for p in plots), dtype=np.float64, count=len(plots)
+    )
+    critical, severe, moderate, healthy = np.bincount(idx, minlength=len(_HEALTH_CLASSES))
+    overall_mean = float(np.mean(ndvi_values))
 
     return {
         "total_plots": len(plots),
-        "healthy_count": classes.count("Healthy"),
-        "moderate_stress_count": classes.count("Moderate Stress"),
-        "severe_stress_count": classes.count("Severe Stress"),
-        "critical_count": classes.count("Critical"),
-        "overall_mean_ndvi": float(np.mean(ndvi_values)),
-        "overall_health": _classify_ndvi(np.mean(ndvi_values))["class"],
+        "healthy_count": int(healthy),
+        "moderate_stress_count": int(moderate),
+        "severe_stress_count": int(severe),
+        "critical_count": int(critical),
+        "overall_mean_ndvi": overall_mean,
+        "overall_health": _classify_ndvi(overall_mean)["class"],
     }
 
 
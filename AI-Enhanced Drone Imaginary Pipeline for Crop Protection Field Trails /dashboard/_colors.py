@@ -0,0 +1,25 @@
+"""
+Dashboard Colour Bands
+=======================
+Threshold → colour lookups shared by the weather page charts, its cards
+and the map popups, so every view colours a reading the same way.
+"""
+
+import numpy as np
+
+# Temperature bands in °C (a value on an edge takes the colder colour)
+TEMP_EDGES = np.array([0, 10, 25, 35])
+TEMP_PALETTE = np.array(["#8b5cf6", "#3b82f6", "#2ecc71", "#f59e0b", "#ef4444"])
+# Soil moisture bands in % (a value on an edge takes the wetter colour)
+SOIL_EDGES = np.array([20, 35])
+SOIL_PALETTE = np.array(["#ef4444", "#f59e0b", "#2ecc71"])
+
+
+def temp_colors(temps) -> np.ndarray:
+    """Colour for each temperature, cold=purple/blue, warm=green, hot=red."""
+    return TEMP_PALETTE[np.searchsorted(TEMP_EDGES, temps, side="left")]
+
+
+def soil_colors(moisture_pct) -> np.ndarray:
+    """Colour for each soil moisture percentage, dry=red, wet=green."""
+    return SOIL_PALETTE[np.searchsorted(SOIL_EDGES, moisture_pct, side="right")]
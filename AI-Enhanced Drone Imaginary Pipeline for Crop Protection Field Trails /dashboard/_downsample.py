@@ -0,0 +1,31 @@
+"""
+Chart Downsampling
+===================
+Point reduction for long chart series, so the browser receives a bounded
+number of points however much history the database holds.
+"""
+
+import numpy as np
+
+
+def lttb_indices(values, n_out: int) -> list:
+    """
+    Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets,
+    which keeps the peaks and dips of an evenly spaced series. The first
+    and last points are always kept.
+    """
+    y = np.asarray(values, dtype=np.float64)
+    edges = np.linspace(1, len(y) - 1, n_out - 1).astype(np.intp)
+    keep = [0]
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nxt_hi = edges[b + 2] if b + 2 < n_out - 1 else len(y)
+        nxt_x = (edges[b + 1] + nxt_hi - 1) / 2
+        nxt_y = y[edges[b + 1]:nxt_hi].mean()
+        prev = keep[-1]
+        xs = np.arange(lo, hi)
+        area = np.abs((prev - nxt_x) * (y[lo:hi] - y[prev]) - (prev - xs) * (nxt_y - y[prev]))
+        keep.append(int(lo + np.argmax(area)))
+    keep.append(len(y) - 1)
+    return keep
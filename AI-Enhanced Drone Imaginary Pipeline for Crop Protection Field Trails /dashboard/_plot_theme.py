@@ -0,0 +1,23 @@
+"""
+Dashboard Plotly Theme
+=======================
+Registers the shared dark chart styling as a Plotly template once per
+process, layered on top of Streamlit's own template, and makes it the
+default. Pages import this module and only pass per-chart layout.
+"""
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st  # noqa: F401  (registers the "streamlit" template first)
+
+pio.templates["dark_dashboard"] = go.layout.Template(
+    layout=go.Layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(color="#64748b", showgrid=False),
+        yaxis=dict(color="#64748b", gridcolor="rgba(100,116,139,0.15)"),
+        legend=dict(font=dict(color="#94a3b8")),
+        margin=dict(t=20, b=50, l=50, r=30),
+    )
+)
+pio.templates.default = "streamlit+dark_dashboard"
@@ -0,0 +1,80 @@
+"""
+Cached Database Access
+=======================
+Streamlit-cached wrappers around DatabaseManager for the dashboard pages.
+Every widget interaction reruns the page script, so the manager is shared
+per server process and query results are reused for a short TTL. The
+multi-location weather snapshot is cached here too. Call
+``st.cache_data.clear()`` after writing to the database to refresh early.
+"""
+
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Seconds a query result is reused before SQLite is hit again
+QUERY_TTL = 30
+# Seconds the multi-location weather snapshot is reused
+WEATHER_TTL = 600
+
+
+@st.cache_resource
+def get_db():
+    """One DatabaseManager per server process instead of one per rerun."""
+    from database.db_manager import DatabaseManager
+    return DatabaseManager()
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def pipeline_stats() -> dict:
+    return get_db().get_pipeline_stats()
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def pipeline_history(limit: int = 20) -> list:
+    return get_db().get_pipeline_history(limit=limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def pipeline_latencies(limit: int = 20) -> dict:
+    return get_db().get_pipeline_latencies(limit=limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def ndvi_history(limit: int = 30) -> list:
+    return get_db().get_ndvi_history(limit=limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def weather_trend(limit: int = 24) -> dict:
+    return get_db().get_weather_trend(limit=limit)
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def latest_ndvi() -> dict:
+    return get_db().get_latest_ndvi()
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def latest_health() -> dict:
+    return get_db().get_latest_health()
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def latest_weather() -> dict:
+    return get_db().get_latest_weather()
+
+
+@st.cache_data(ttl=QUERY_TTL, show_spinner=False)
+def overview_bundle() -> dict:
+    return get_db().get_overview_bundle()
+
+
+@st.cache_data(ttl=WEATHER_TTL, show_spinner=False)
+def multi_location_weather() -> dict:
+    """Weather for every monitored location, shared by the map and weather pages."""
+    from data_ingestion.weather_fetcher import get_multi_location_weather
+    return get_multi_location_weather()
@@ -5,23 +5,26 @@ Interactive Leaflet map with NDVI overlay, health polygons,
 country/state boundaries, and multi-location weather.
 """
 
-import json
+import shutil
 import sys
 from pathlib import Path
 
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
-from folium.plugins import MiniMap
-import numpy as np
+from folium.plugins import MarkerCluster, MiniMap
+import orjson
 import branca.colormap as cm
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
+from dashboard._colors import temp_colors
 
 
 def render():
     """Render the Live Map page."""
+    from dashboard import db_cache
+
     st.markdown("""
     <h1 style='background: linear-gradient(135deg, #60a5fa, #34d399);
     -webkit-background-clip: text; -webkit-text-fill-color: transparent;
@@ -67,8 +70,7 @@ def render():
         zoom = 14
 
     # ── Fetch multi-location weather ─────────────────────────
-    from data_ingestion.weather_fetcher import get_multi_location_weather, GLOBAL_LOCATIONS
-    multi_weather = get_multi_location_weather() if show_weather else {}
+    multi_weather = db_cache.multi_location_weather() if show_weather else {}
 
     # ── Create Folium Map ────────────────────────────────────
     m = folium.Map(
@@ -127,122 +129,26 @@ def render():
 
     # ── Weather Markers for All Locations ────────────────────
     if show_weather and multi_weather:
-        # US weather group
-        us_group = folium.FeatureGroup(name="🇺🇸 US Weather")
-        intl_group = folium.FeatureGroup(name="🌍 Global Weather")
-
-        for name, wx in multi_weather.items():
-            loc_info = GLOBAL_LOCATIONS.get(name, {})
-            lat = loc_info.get("lat", 0)
-            lon = loc_info.get("lon", 0)
-            region = wx.get("region", "US")
-            crop = wx.get("crop", "")
-            current = wx.get("current", {})
-
-            temp = current.get("temperature_c", 0)
-            humidity = current.get("humidity_pct", 0)
-            wind = current.get("wind_speed_ms", 0)
-            desc = current.get("description", "N/A")
-            clouds = current.get("cloud_cover_pct", 0)
-            soil = wx.get("soil", {})
-            soil_m = soil.get("moisture", 0)
-            soil_t = soil.get("temperature_c", 0)
-            rain = wx.get("precipitation", {}).get("rain_mm", 0)
-            alerts = wx.get("agricultural_alerts", [])
-
-            # Choose icon based on conditions
-            if rain > 1:
-                wx_icon = "🌧️"
-            elif clouds > 70:
-                wx_icon = "☁️"
-            elif clouds > 30:
-                wx_icon = "⛅"
-            elif temp > 35:
-                wx_icon = "🔥"
-            elif temp < 0:
-                wx_icon = "❄️"
-            else:
-                wx_icon = "☀️"
-
-            # Temperature color
-            if temp > 35:
-                temp_color = "#ef4444"
-            elif temp > 25:
-                temp_color = "#f59e0b"
-            elif temp > 10:
-                temp_color = "#2ecc71"
-            elif temp > 0:
-                temp_color = "#3b82f6"
-            else:
-                temp_color = "#8b5cf6"
-
-            # Alert badges
-            alert_html = ""
-            for alert in alerts[:2]:
-                atype = alert.get("type", "INFO")
-                acolor = "#ef4444" if atype == "CRITICAL" else "#f59e0b" if atype == "WARNING" else "#2ecc71"
-                alert_html += f"""<span style='display:inline-block; background:{acolor}22;
-                    color:{acolor}; padding: 2px 6px; border-radius:4px;
-                    font-size:10px; margin: 2px 1px;'>{alert.get('category','').title()}</span>"""
-
-            # Build popup
-            is_active = (name == "Iowa, USA")
-            popup_html = f"""
-            <div style='font-family: Inter, sans-serif; min-width: 260px; padding: 4px;'>
-                <h3 style='margin: 0 0 4px 0; color: #1e3a5f; font-size: 15px;
-                border-bottom: 2px solid {"#2ecc71" if is_active else "#3b82f6"};
-                padding-bottom: 4px;'>
-                    {wx_icon} {name} {'🟢' if is_active else ''}
-                </h3>
-                <p style='margin: 2px 0; color: #64748b; font-size: 11px;'>
-                    🌾 {crop} &nbsp;|&nbsp; 📍 {lat:.2f}°, {lon:.2f}°
-                </p>
-                <table style='width:100%; font-size:12px; border-collapse:collapse; margin: 6px 0;'>
-                    <tr style='border-bottom: 1px solid #eee;'>
-                        <td style='padding:3px;'>🌡️ <b>Temperature</b></td>
-                        <td style='text-align:right; color:{temp_color}; font-weight:700;'>{temp:.1f}°C</td>
-                    </tr>
-                    <tr style='border-bottom: 1px solid #eee;'>
-                        <td style='padding:3px;'>💧 <b>Humidity</b></td>
-                        <td style='text-align:right;'>{humidity:.0f}%</td>
-                    </tr>
-                    <tr style='border-bottom: 1px solid #eee;'>
-                        <td style='padding:3px;'>💨 <b>Wind</b></td>
-                        <td style='text-align:right;'>{wind:.1f} m/s</td>
-                    </tr>
-                    <tr style='border-bottom: 1px solid #eee;'>
-                        <td style='padding:3px;'>🌧️ <b>Rain</b></td>
-                        <td style='text-align:right;'>{rain:.1f} mm</td>
-                    </tr>
-                    <tr style='border-bottom: 1px solid #eee;'>
-                        <td style='padding:3px;'>🌱 <b>Soil Moisture</b></td>
-                        <td style='text-align:right;'>{soil_m:.0%}</td>
-                    </tr>
-                    <tr>
-                        <td style='padding:3px;'>🌍 <b>Soil Temp</b></td>
-                        <td style='text-align:right;'>{soil_t:.1f}°C</td>
-                    </tr>
-                </table>
-                <div style='margin: 4px 0;'>{alert_html}</div>
-                <p style='margin: 2px 0; color: #94a3b8; font-size: 10px;
-                text-align:right;'>☁️ {desc.title()}</p>
-            </div>
-            """
+        # US / global weather groups, clustered so Leaflet only draws the
+        # markers that are visible at the current zoom
+        us_group = MarkerCluster(name="🇺🇸 US Weather")
+        intl_group = MarkerCluster(name="🌍 Global Weather")
 
+        for marker_info in _weather_marker_content(multi_weather):
             # Marker icon
-            if is_active:
+            if marker_info["is_active"]:
                 icon = folium.Icon(color="green", icon="leaf", prefix="fa")
             else:
                 icon = folium.Icon(color="cadetblue", icon="cloud", prefix="fa")
 
             marker = folium.Marker(
-                location=[lat, lon],
-                popup=folium.Popup(popup_html, max_width=300),
-                tooltip=f"{wx_icon} {name}: {temp:.0f}°C, {desc}",
+                location=[marker_info["lat"], marker_info["lon"]],
+                popup=folium.Popup(marker_info["popup_html"], max_width=300),
+                tooltip=marker_info["tooltip"],
                 icon=icon,
             )
 
-            if region == "US":
+            if marker_info["region"] == "US":
                 marker.add_to(us_group)
             else:
                 marker.add_to(intl_group)
@@ -344,54 +250,212 @@ def render():
         """, unsafe_allow_html=True)
 
 
+_WEATHER_POPUP_TEMPLATE = """
+            <div style='font-family: Inter, sans-serif; min-width: 260px; padding: 4px;'>
+                <h3 style='margin: 0 0 4px 0; color: #1e3a5f; font-size: 15px;
+                border-bottom: 2px solid {border_color};
+                padding-bottom: 4px;'>
+                    {wx_icon} {name} {active_badge}
+                </h3>
+                <p style='margin: 2px 0; color: #64748b; font-size: 11px;'>
+                    🌾 {crop} &nbsp;|&nbsp; 📍 {lat:.2f}°, {lon:.2f}°
+                </p>
+                <table style='width:100%; font-size:12px; border-collapse:collapse; margin: 6px 0;'>
+                    <tr style='border-bottom: 1px solid #eee;'>
+                        <td style='padding:3px;'>🌡️ <b>Temperature</b></td>
+                        <td style='text-align:right; color:{temp_color}; font-weight:700;'>{temp:.1f}°C</td>
+                    </tr>
+                    <tr style='border-bottom: 1px solid #eee;'>
+                        <td style='padding:3px;'>💧 <b>Humidity</b></td>
+                        <td style='text-align:right;'>{humidity:.0f}%</td>
+                    </tr>
+                    <tr style='border-bottom: 1px solid #eee;'>
+                        <td style='padding:3px;'>💨 <b>Wind</b></td>
+                        <td style='text-align:right;'>{wind:.1f} m/s</td>
+                    </tr>
+                    <tr style='border-bottom: 1px solid #eee;'>
+                        <td style='padding:3px;'>🌧️ <b>Rain</b></td>
+                        <td style='text-align:right;'>{rain:.1f} mm</td>
+                    </tr>
+                    <tr style='border-bottom: 1px solid #eee;'>
+                        <td style='padding:3px;'>🌱 <b>Soil Moisture</b></td>
+                        <td style='text-align:right;'>{soil_m:.0%}</td>
+                    </tr>
+                    <tr>
+                        <td style='padding:3px;'>🌍 <b>Soil Temp</b></td>
+                        <td style='text-align:right;'>{soil_t:.1f}°C</td>
+                    </tr>
+                </table>
+                <div style='margin: 4px 0;'>{alert_html}</div>
+                <p style='margin: 2px 0; color: #94a3b8; font-size: 10px;
+                text-align:right;'>☁️ {desc_title}</p>
+            </div>
+            """
+
+_ALERT_BADGE_TEMPLATE = """<span style='display:inline-block; background:{color}22;
+                    color:{color}; padding: 2px 6px; border-radius:4px;
+                    font-size:10px; margin: 2px 1px;'>{category}</span>"""
+
+
+@st.cache_data(max_entries=8)
+def _weather_marker_content(multi_weather: dict) -> list:
+    """
+    Popup HTML and tooltip for each weather location. Keyed on the weather
+    data, so the markup is only rebuilt when the weather refreshes.
+    """
+    from data_ingestion.weather_fetcher import GLOBAL_LOCATIONS
+
+    # Popup temperature colours for every location in one lookup
+    popup_temp_colors = temp_colors(
+        [wx.get("current", {}).get("temperature_c", 0) for wx in multi_weather.values()]
+    )
+
+    markers = []
+    for (name, wx), temp_color in zip(multi_weather.items(), popup_temp_colors):
+        loc_info = GLOBAL_LOCATIONS.get(name, {})
+        lat = loc_info.get("lat", 0)
+        lon = loc_info.get("lon", 0)
+        current = wx.get("current", {})
+
+        temp = current.get("temperature_c", 0)
+        desc = current.get("description", "N/A")
+        clouds = current.get("cloud_cover_pct", 0)
+        soil = wx.get("soil", {})
+        rain = wx.get("precipitation", {}).get("rain_mm", 0)
+        alerts = wx.get("agricultural_alerts", [])
+
+        # Choose icon based on conditions
+        if rain > 1:
+            wx_icon = "🌧️"
+        elif clouds > 70:
+            wx_icon = "☁️"
+        elif clouds > 30:
+            wx_icon = "⛅"
+        elif temp > 35:
+            wx_icon = "🔥"
+        elif temp < 0:
+            wx_icon = "❄️"
+        else:
+            wx_icon = "☀️"
+
+        # Alert badges
+        alert_html = ""
+        for alert in alerts[:2]:
+            atype = alert.get("type", "INFO")
+            acolor = "#ef4444" if atype == "CRITICAL" else "#f59e0b" if atype == "WARNING" else "#2ecc71"
+            alert_html += _ALERT_BADGE_TEMPLATE.format_map(
+                {"color": acolor, "category": alert.get("category", "").title()}
+            )
+
+        is_active = (name == "Iowa, USA")
+        popup_html = _WEATHER_POPUP_TEMPLATE.format_map({
+            "border_color": "#2ecc71" if is_active else "#3b82f6",
+            "wx_icon": wx_icon,
+            "name": name,
+            "active_badge": "🟢" if is_active else "",
+            "crop": wx.get("crop", ""),
+            "lat": lat,
+            "lon": lon,
+            "temp_color": temp_color,
+            "temp": temp,
+            "humidity": current.get("humidity_pct", 0),
+            "wind": current.get("wind_speed_ms", 0),
+            "rain": rain,
+            "soil_m": soil.get("moisture", 0),
+            "soil_t": soil.get("temperature_c", 0),
+            "alert_html": alert_html,
+            "desc_title": desc.title(),
+        })
+
+        markers.append({
+            "lat": lat,
+            "lon": lon,
+            "region": wx.get("region", "US"),
+            "is_active": is_active,
+            "popup_html": popup_html,
+            "tooltip": f"{wx_icon} {name}: {temp:.0f}°C, {desc}",
+        })
+    return markers
+
+
 def _add_ndvi_overlay(m):
     """Add NDVI color-mapped overlay to map."""
     processed_dir = config.PROCESSED_DIR
-    ndvi_rgbs = sorted(processed_dir.glob("ndvi_rgb_*.png"), reverse=True)
-    if ndvi_rgbs:
-        import base64
-        with open(ndvi_rgbs[0], "rb") as f:
-            img_data = base64.b64encode(f.read()).decode()
+    latest_rgb = max(processed_dir.glob("ndvi_rgb_*.png"), default=None)
+    if latest_rgb is not None:
+        served = _publish_static(latest_rgb)
         bbox = config.FIELD_BBOX
         bounds = [[bbox["south"], bbox["west"]], [bbox["north"], bbox["east"]]]
-        folium.raster_layers.ImageOverlay(
-            image=f"data:image/png;base64,{img_data}",
-            bounds=bounds, opacity=0.7, name="🌿 NDVI Heatmap",
-        ).add_to(m)
+        overlay = folium.raster_layers.ImageOverlay(
+            image="data:,", bounds=bounds, opacity=0.7, name="🌿 NDVI Heatmap",
+        )
+        # Reference the PNG through Streamlit's static route rather than
+        # inlining it as base64, so the browser fetches and caches it once.
+        # folium only takes absolute URLs, so the path is set afterwards on
+        # the attribute its template renders (folium is pinned for this).
+        overlay.url = f"/app/static/{served.name}"
+        overlay.add_to(m)
+
+
+def _publish_static(png_path: Path) -> Path:
+    """
+    Copy an NDVI map into the static folder Streamlit serves, if out of
+    date. Each run's map has a new name, so publishing one removes the
+    copies of older maps rather than letting the folder grow.
+    """
+    target = config.STATIC_DIR / png_path.name
+    if not target.exists() or target.stat().st_mtime_ns != png_path.stat().st_mtime_ns:
+        shutil.copy2(png_path, target)
+        for stale in config.STATIC_DIR.glob("ndvi_rgb_*.png"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+    return target
 
 
 def _add_plot_boundaries(m):
     """Add segmented plot boundaries to map."""
     geojson_path = config.PROCESSED_DIR / "plots.geojson"
     if geojson_path.exists():
-        with open(geojson_path) as f:
-            geojson = json.load(f)
+        geojson = _load_plot_geojson(str(geojson_path), geojson_path.stat().st_mtime_ns)
         plot_group = folium.FeatureGroup(name="🔬 Plot Health Zones")
-        for feature in geojson.get("features", []):
-            props = feature.get("properties", {})
-            color = props.get("health_color", "#3b82f6")
-            ndvi = props.get("mean_ndvi", 0)
-            tooltip = (
-                f"<b>Plot #{props.get('plot_id', '?')}</b><br>"
-                f"Health: {props.get('health_class', 'Unknown')}<br>"
-                f"NDVI: {ndvi:.3f}<br>"
-                f"Area: {props.get('area_pixels', 0)} px"
-            )
+        # One GeoJson layer for all plots; colour comes from each feature.
+        # GeoJsonTooltip rejects fields missing from the data, so a run that
+        # segmented no plots leaves the group empty.
+        if geojson.get("features"):
             folium.GeoJson(
-                feature,
-                style_function=lambda x, c=color: {
-                    "fillColor": c, "color": c, "weight": 2, "fillOpacity": 0.3,
-                },
-                tooltip=folium.Tooltip(tooltip),
+                geojson,
+                style_function=_plot_style,
+                tooltip=folium.GeoJsonTooltip(
+                    fields=["plot_id", "health_class", "mean_ndvi", "area_pixels"],
+                    aliases=["Plot #", "Health:", "NDVI:", "Area (px):"],
+                ),
             ).add_to(plot_group)
         plot_group.add_to(m)
 
 
+@st.cache_data(max_entries=4)
+def _load_plot_geojson(geojson_path: str, mtime_ns: int) -> dict:
+    """Parse plots.geojson once per file version, with tooltip-ready values."""
+    geojson = orjson.loads(Path(geojson_path).read_bytes())
+    for feature in geojson.get("features", []):
+        props = feature.setdefault("properties", {})
+        props.setdefault("plot_id", "?")
+        props.setdefault("health_class", "Unknown")
+        props["mean_ndvi"] = round(props.get("mean_ndvi", 0), 3)
+        props.setdefault("area_pixels", 0)
+    return geojson
+
+
+def _plot_style(feature):
+    """Style a plot polygon by its health colour."""
+    color = feature["properties"].get("health_color", "#3b82f6")
+    return {"fillColor": color, "color": color, "weight": 2, "fillOpacity": 0.3}
+
+
 def _add_weather_marker(m, lat, lon):
     """Add detailed field weather marker."""
-    from database.db_manager import DatabaseManager
-    db = DatabaseManager()
-    weather = db.get_latest_weather()
+    from dashboard import db_cache
+    weather = db_cache.latest_weather()
     if weather:
         temp = weather.get("temperature_c", "N/A")
         humidity = weather.get("humidity_pct", "N/A")
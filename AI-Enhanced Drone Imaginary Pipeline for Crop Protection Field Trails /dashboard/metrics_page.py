@@ -4,15 +4,16 @@ Pipeline Metrics Dashboard Page
 Processing latency, success rate, and resource efficiency metrics.
 """
 
-import json
 import sys
 from pathlib import Path
 
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from dashboard import _plot_theme  # noqa: F401  (default chart template)
+from dashboard._downsample import lttb_indices
 
 
 def render():
@@ -28,11 +29,10 @@ def render():
     </p>
     """, unsafe_allow_html=True)
 
-    from database.db_manager import DatabaseManager
-    db = DatabaseManager()
+    from dashboard import db_cache
 
-    stats = db.get_pipeline_stats()
-    runs = db.get_pipeline_history(limit=20)
+    stats = db_cache.pipeline_stats()
+    runs = db_cache.pipeline_history(limit=10)
 
     # ── KPI Row ──────────────────────────────────────────────
     c1, c2, c3, c4 = st.columns(4)
@@ -60,40 +60,13 @@ def render():
                     unsafe_allow_html=True)
 
         if runs:
-            completed_runs = [r for r in runs if r.get("status") == "completed"
-                             and r.get("processing_time_s")]
-            if completed_runs:
-                timestamps = [r["start_time"][:16] for r in reversed(completed_runs)]
-                times = [r["processing_time_s"] for r in reversed(completed_runs)]
-
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=timestamps, y=times,
-                    marker=dict(
-                        color=times,
-                        colorscale=[[0, "#2ecc71"], [0.5, "#f59e0b"], [1, "#ef4444"]],
-                        line=dict(width=0),
-                    ),
-                    text=[f"{t:.1f}s" for t in times],
-                    textposition="outside",
-                    textfont=dict(color="#94a3b8", size=11),
-                    hovertemplate="Time: %{x}<br>Latency: %{y:.1f}s<extra></extra>",
-                ))
-
-                avg = sum(times) / len(times) if times else 0
-                fig.add_hline(y=avg, line_dash="dash", line_color="#3b82f6",
-                             annotation_text=f"Avg: {avg:.1f}s")
-
-                fig.update_layout(
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    xaxis=dict(showgrid=False, color="#64748b", tickangle=-45),
-                    yaxis=dict(title="Seconds", color="#64748b",
-                              showgrid=True, gridcolor="rgba(100,116,139,0.15)"),
-                    margin=dict(t=30, b=60, l=50, r=30),
-                    height=320,
-                    showlegend=False,
-                )
+            # The whole completed history; _latency_figure downsamples it
+            latencies = db_cache.pipeline_latencies(limit=None)
+            if latencies["start_time"]:
+                timestamps = tuple(t[:16] for t in latencies["start_time"])
+                times = np.array(latencies["processing_time_s"], dtype=np.float64)
+
+                fig = _latency_figure(timestamps, times)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No completed runs yet")
@@ -104,44 +77,19 @@ def render():
         st.markdown('<div class="section-header">📊 Pipeline Step Breakdown</div>',
                     unsafe_allow_html=True)
 
-        # Simulated step breakdown (representative of typical run)
-        steps = ["Ingest", "Weather", "NDVI Calc", "Classify", "Segment", "Store"]
         avg_latency = stats.get("avg_processing_time_s", 5) or 5
-        step_pcts = [0.15, 0.10, 0.30, 0.20, 0.15, 0.10]
-        step_times = [avg_latency * p for p in step_pcts]
-        step_colors = ["#3b82f6", "#8b5cf6", "#2ecc71", "#f59e0b", "#ef4444", "#64748b"]
-
-        fig = go.Figure(data=[go.Pie(
-            labels=steps, values=step_times,
-            marker=dict(colors=step_colors),
-            hole=0.45,
-            textinfo="label+percent",
-            textfont=dict(size=12, color="white"),
-            hovertemplate="<b>%{label}</b><br>%{value:.1f}s (%{percent})<extra></extra>",
-        )])
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            margin=dict(t=20, b=20, l=20, r=20),
-            height=320,
-            showlegend=False,
-            annotations=[dict(
-                text=f"<b>{avg_latency:.1f}s</b><br><span style='font-size:10px'>total</span>",
-                x=0.5, y=0.5, font_size=18, showarrow=False, font_color="#f0f4f8",
-            )],
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_step_breakdown_figure(avg_latency), use_container_width=True)
 
     # ── Run History Table ────────────────────────────────────
     st.markdown('<div class="section-header">📋 Run History</div>',
                 unsafe_allow_html=True)
 
     if runs:
-        for run in runs[:10]:
+        # One markdown element for the whole history rather than one per run
+        run_html = []
+        for run in runs:
             status = run.get("status", "unknown")
-            icon = "✅" if status == "completed" else "❌" if status == "failed" else "⏳"
-            color = "#2ecc71" if status == "completed" else "#ef4444" if status == "failed" else "#f59e0b"
-            time_s = run.get("processing_time_s", 0) or 0
+            icon, color = _STATUS_STYLES.get(status, ("⏳", "#f59e0b"))
             steps = run.get("steps_completed", "")
             error = run.get("error_message", "")
 
@@ -149,23 +97,16 @@ def render():
             if error:
                 detail = f"Error: {error}"
 
-            st.markdown(f"""
-            <div style='background: rgba(26,31,46,0.6); border-radius: 10px;
-            padding: 0.8rem 1.2rem; margin: 0.3rem 0; display: flex;
-            justify-content: space-between; align-items: center;
-            border-left: 3px solid {color};'>
-                <div>
-                    <strong style='color: #f0f4f8;'>{icon} Run #{run.get('id', '?')}</strong>
-                    <span style='color: #64748b; margin-left: 1rem;'>{run.get('start_time', '')[:19]}</span>
-                    <br><span style='color: #94a3b8; font-size: 0.8rem;'>{detail}</span>
-                </div>
-                <div style='text-align: right;'>
-                    <span style='color: {color}; font-family: JetBrains Mono;
-                    font-size: 1.1rem; font-weight: 700;'>{time_s:.1f}s</span>
-                    <br><span class="status-badge" style='background: {color}22; color: {color};'>{status}</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            run_html.append(_RUN_ROW_TEMPLATE.format(
+                color=color,
+                icon=icon,
+                id=run.get("id", "?"),
+                start=run.get("start_time", "")[:19],
+                detail=detail,
+                time_s=run.get("processing_time_s", 0) or 0,
+                status=status,
+            ))
+        st.markdown("".join(run_html), unsafe_allow_html=True)
     else:
         st.info("No pipeline runs recorded. Click '🔄 Run Pipeline' to start!")
 
@@ -218,6 +159,110 @@ def render():
         """, unsafe_allow_html=True)
 
 
+# Above this many bars the per-bar latency labels overlap. The page plots
+# every completed run, so a history past this is drawn unlabelled.
+_MAX_BAR_LABELS = 30
+# Longer histories are downsampled to this many bars before plotting
+_MAX_TIMELINE_POINTS = 500
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _latency_figure(timestamps: tuple, times: np.ndarray) -> go.Figure:
+    """
+    Processing latency bars for completed runs, oldest first. Bars are only
+    labelled up to _MAX_BAR_LABELS bars, counted after downsampling; longer
+    histories rely on hover.
+    """
+    avg = float(times.mean()) if times.size else 0
+    if times.size > _MAX_TIMELINE_POINTS:
+        keep = lttb_indices(times, _MAX_TIMELINE_POINTS)
+        timestamps = [timestamps[i] for i in keep]
+        times = times[keep]
+
+    labelled = times.size <= _MAX_BAR_LABELS
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=timestamps, y=times,
+        marker=dict(
+            color=times,
+            colorscale=[[0, "#2ecc71"], [0.5, "#f59e0b"], [1, "#ef4444"]],
+            line=dict(width=0),
+        ),
+        text=[f"{t:.1f}s" for t in times] if labelled else None,
+        textposition="outside" if labelled else "none",
+        textfont=dict(color="#94a3b8", size=11),
+        hovertemplate="Time: %{x}<br>Latency: %{y:.1f}s<extra></extra>",
+    ))
+
+    fig.add_hline(y=avg, line_dash="dash", line_color="#3b82f6",
+                 annotation_text=f"Avg: {avg:.1f}s")
+
+    fig.update_layout(
+        xaxis=dict(tickangle=-45),
+        yaxis=dict(title="Seconds"),
+        margin=dict(t=30, b=60),
+        height=320,
+        showlegend=False,
+    )
+    return fig
+
+
+# Run history row markup, filled per run
+_STATUS_STYLES = {"completed": ("✅", "#2ecc71"), "failed": ("❌", "#ef4444")}
+_RUN_ROW_TEMPLATE = """
+            <div style='background: rgba(26,31,46,0.6); border-radius: 10px;
+            padding: 0.8rem 1.2rem; margin: 0.3rem 0; display: flex;
+            justify-content: space-between; align-items: center;
+            border-left: 3px solid {color};'>
+                <div>
+                    <strong style='color: #f0f4f8;'>{icon} Run #{id}</strong>
+                    <span style='color: #64748b; margin-left: 1rem;'>{start}</span>
+                    <br><span style='color: #94a3b8; font-size: 0.8rem;'>{detail}</span>
+                </div>
+                <div style='text-align: right;'>
+                    <span style='color: {color}; font-family: JetBrains Mono;
+                    font-size: 1.1rem; font-weight: 700;'>{time_s:.1f}s</span>
+                    <br><span class="status-badge" style='background: {color}22; color: {color};'>{status}</span>
+                </div>
+            </div>
+            """
+
+# Simulated step breakdown (representative of typical run). Only the step
+# times and the centre label depend on the average latency, so the pie is
+# built once and copied per latency.
+_STEPS = ["Ingest", "Weather", "NDVI Calc", "Classify", "Segment", "Store"]
+_STEP_PCTS = [0.15, 0.10, 0.30, 0.20, 0.15, 0.10]
+_STEP_COLORS = ["#3b82f6", "#8b5cf6", "#2ecc71", "#f59e0b", "#ef4444", "#64748b"]
+
+_STEP_PIE = go.Figure(data=[go.Pie(
+    labels=_STEPS, values=_STEP_PCTS,
+    marker=dict(colors=_STEP_COLORS),
+    hole=0.45,
+    textinfo="label+percent",
+    textfont=dict(size=12, color="white"),
+    hovertemplate="<b>%{label}</b><br>%{value:.1f}s (%{percent})<extra></extra>",
+)])
+_STEP_PIE.update_layout(
+    margin=dict(t=20, b=20, l=20, r=20),
+    height=320,
+    showlegend=False,
+)
+
+
+@st.cache_data(show_spinner=False)
+def _step_breakdown_figure(avg_latency: float) -> go.Figure:
+    """Step breakdown pie scaled to ``avg_latency`` seconds."""
+    fig = go.Figure(_STEP_PIE)
+    fig.data[0].values = [avg_latency * p for p in _STEP_PCTS]
+    fig.update_layout(
+        annotations=[dict(
+            text=f"<b>{avg_latency:.1f}s</b><br><span style='font-size:10px'>total</span>",
+            x=0.5, y=0.5, font_size=18, showarrow=False, font_color="#f0f4f8",
+        )],
+    )
+    return fig
+
+
 def _metric_card(label, value, color, icon):
     st.markdown(f"""
     <div class="kpi-card">
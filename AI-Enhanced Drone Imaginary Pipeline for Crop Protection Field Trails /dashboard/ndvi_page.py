@@ -9,11 +9,16 @@ from pathlib import Path
 
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
+from dashboard import _plot_theme  # noqa: F401  (default chart template)
+
+# Histogram bar colors by health class, lowest NDVI first; a bin edge equal
+# to a threshold takes the lower class
+_BIN_THRESHOLDS = np.array([config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY])
+_BIN_PALETTE = np.array(["#8e44ad", "#e74c3c", "#f59e0b", "#2ecc71"])
 
 
 def render():
@@ -29,9 +34,8 @@ def render():
     </p>
     """, unsafe_allow_html=True)
 
-    from database.db_manager import DatabaseManager
-    db = DatabaseManager()
-    ndvi_history = db.get_ndvi_history(limit=20)
+    from dashboard import db_cache
+    ndvi_history = db_cache.ndvi_history(limit=20)
 
     if not ndvi_history:
         st.warning("No NDVI data available. Run the pipeline first!")
@@ -61,34 +65,20 @@ def render():
 
         # Try to load actual NDVI data for histogram
         ndvi_file = latest.get("file_path", "")
-        ndvi_values = None
+        histogram = None
 
         if ndvi_file and Path(ndvi_file).exists():
             try:
-                import rasterio
-                with rasterio.open(ndvi_file) as src:
-                    ndvi_arr = src.read(1).flatten()
-                    ndvi_values = ndvi_arr[ndvi_arr > -9999]
+                histogram = _ndvi_histogram(ndvi_file, Path(ndvi_file).stat().st_mtime_ns)
             except Exception:
                 pass
 
-        if ndvi_values is not None and len(ndvi_values) > 0:
+        if histogram is not None:
             fig = go.Figure()
 
             # Create histogram with color-coded bins
-            bins = np.linspace(-0.2, 1.0, 60)
-            counts, edges = np.histogram(ndvi_values, bins=bins)
-
-            colors = []
-            for edge in edges[:-1]:
-                if edge > config.NDVI_HEALTHY:
-                    colors.append("#2ecc71")
-                elif edge > config.NDVI_MODERATE:
-                    colors.append("#f59e0b")
-                elif edge > config.NDVI_SEVERE:
-                    colors.append("#e74c3c")
-                else:
-                    colors.append("#8e44ad")
+            counts, edges = histogram
+            colors = _BIN_PALETTE[np.searchsorted(_BIN_THRESHOLDS, edges[:-1], side="left")].tolist()
 
             fig.add_trace(go.Bar(
                 x=edges[:-1], y=counts,
@@ -107,13 +97,9 @@ def render():
                              annotation_text=label, annotation_font_color=color)
 
             fig.update_layout(
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                xaxis=dict(title="NDVI Value", color="#64748b",
-                          showgrid=False, range=[-0.2, 1.05]),
-                yaxis=dict(title="Pixel Count", color="#64748b",
-                          showgrid=True, gridcolor="rgba(100,116,139,0.15)"),
-                margin=dict(t=30, b=50, l=50, r=30),
+                xaxis=dict(title="NDVI Value", range=[-0.2, 1.05]),
+                yaxis=dict(title="Pixel Count"),
+                margin=dict(t=30),
                 height=350,
                 showlegend=False,
             )
@@ -149,13 +135,8 @@ def render():
         ))
 
         fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            xaxis=dict(color="#64748b", showgrid=False),
-            yaxis=dict(color="#64748b", showgrid=True,
-                      gridcolor="rgba(100,116,139,0.15)",
-                      title="Percentage (%)"),
-            margin=dict(t=30, b=50, l=50, r=30),
+            yaxis=dict(title="Percentage (%)"),
+            margin=dict(t=30),
             height=350,
             showlegend=False,
         )
@@ -167,31 +148,21 @@ def render():
 
     img_col1, img_col2, img_col3 = st.columns(3)
 
-    processed_dir = config.PROCESSED_DIR
-
-    with img_col1:
-        st.markdown("**True Color (RGB)**")
-        rgb_files = sorted(processed_dir.glob("rgb_*.png"), reverse=True)
-        if rgb_files:
-            st.image(str(rgb_files[0]), use_container_width=True)
-        else:
-            st.info("Run pipeline to generate")
-
-    with img_col2:
-        st.markdown("**NDVI Heatmap**")
-        ndvi_files = sorted(processed_dir.glob("ndvi_rgb_*.png"), reverse=True)
-        if ndvi_files:
-            st.image(str(ndvi_files[0]), use_container_width=True)
-        else:
-            st.info("Run pipeline to generate")
-
-    with img_col3:
-        st.markdown("**False Color (NIR)**")
-        fc_files = sorted(processed_dir.glob("false_color_*.png"), reverse=True)
-        if fc_files:
-            st.image(str(fc_files[0]), use_container_width=True)
-        else:
-            st.info("Run pipeline to generate")
+    # Directory mtime changes whenever the pipeline writes a new image
+    processed_mtime = config.PROCESSED_DIR.stat().st_mtime_ns
+
+    for col, title, prefix in [
+        (img_col1, "**True Color (RGB)**", "rgb"),
+        (img_col2, "**NDVI Heatmap**", "ndvi_rgb"),
+        (img_col3, "**False Color (NIR)**", "false_color"),
+    ]:
+        with col:
+            st.markdown(title)
+            image = _latest_png(prefix, processed_mtime)
+            if image is not None:
+                st.image(image, use_container_width=True)
+            else:
+                st.info("Run pipeline to generate")
 
     # ── NDVI Time Series ────────────────────────────────────
     st.markdown('<div class="section-header">📉 NDVI Time Series</div>',
@@ -199,41 +170,88 @@ def render():
 
     if len(ndvi_history) > 1:
         timestamps = [r.get("timestamp", "")[:16] for r in reversed(ndvi_history)]
-        means = [r.get("ndvi_mean", 0) or 0 for r in reversed(ndvi_history)]
-        healthy = [r.get("healthy_pct", 0) or 0 for r in reversed(ndvi_history)]
+        means = np.fromiter((r.get("ndvi_mean", 0) or 0 for r in reversed(ndvi_history)),
+                            dtype=np.float64, count=len(ndvi_history))
+        healthy = np.fromiter((r.get("healthy_pct", 0) or 0 for r in reversed(ndvi_history)),
+                              dtype=np.float64, count=len(ndvi_history))
 
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=timestamps, y=means, mode="lines+markers",
-            name="NDVI Mean",
-            line=dict(color="#3b82f6", width=3),
-            marker=dict(size=8),
-        ))
-        fig.add_trace(go.Scatter(
-            x=timestamps, y=[h/100 for h in healthy], mode="lines+markers",
-            name="Healthy %",
-            line=dict(color="#2ecc71", width=2, dash="dot"),
-            marker=dict(size=6),
-            yaxis="y2",
-        ))
-
-        fig.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            xaxis=dict(color="#64748b", showgrid=False, tickangle=-45),
-            yaxis=dict(title="NDVI", color="#3b82f6",
-                      showgrid=True, gridcolor="rgba(100,116,139,0.15)"),
-            yaxis2=dict(title="Healthy %", color="#2ecc71",
-                       overlaying="y", side="right",
-                       tickformat=".0%"),
-            margin=dict(t=20, b=60, l=50, r=60),
-            height=300,
-            legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center",
-                       font=dict(color="#94a3b8")),
-        )
+        fig = _ndvi_series_figure(tuple(timestamps), means, healthy)
         st.plotly_chart(fig, use_container_width=True)
 
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def _ndvi_series_figure(timestamps: tuple, means: np.ndarray,
+                        healthy: np.ndarray) -> go.Figure:
+    """NDVI mean and healthy-share time series, oldest first."""
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=means, mode="lines+markers",
+        name="NDVI Mean",
+        line=dict(color="#3b82f6", width=3),
+        marker=dict(size=8),
+    ))
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=healthy / 100, mode="lines+markers",
+        name="Healthy %",
+        line=dict(color="#2ecc71", width=2, dash="dot"),
+        marker=dict(size=6),
+        yaxis="y2",
+    ))
+
+    fig.update_layout(
+        xaxis=dict(tickangle=-45),
+        yaxis=dict(title="NDVI", color="#3b82f6"),
+        yaxis2=dict(title="Healthy %", color="#2ecc71",
+                   overlaying="y", side="right",
+                   tickformat=".0%"),
+        margin=dict(b=60, r=60),
+        height=300,
+        legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center"),
+    )
+    return fig
+
+
+@st.cache_data(persist="disk", max_entries=8, show_spinner=False)
+def _ndvi_histogram(ndvi_file: str, mtime_ns: int):
+    """
+    NDVI histogram counts and bin edges for the distribution chart.
+
+    Large rasters are read decimated to at most 1024 x 1024 with nearest
+    resampling, which samples pixel values without smoothing the
+    distribution. Returns None if the raster has no valid pixels.
+
+    Results persist on disk across app restarts; ``mtime_ns`` keys them to
+    one version of the file, so no TTL is needed.
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+
+    with rasterio.open(ndvi_file) as src:
+        out_shape = (min(src.height, 1024), min(src.width, 1024))
+        ndvi_arr = src.read(1, out_shape=out_shape, resampling=Resampling.nearest).ravel()
+    # Skip the compacting copy when there is no nodata, the usual case
+    valid = ndvi_arr > -9999
+    ndvi_values = ndvi_arr if valid.all() else ndvi_arr[valid]
+    if ndvi_values.size == 0:
+        return None
+
+    # Explicit float64 edges keep np.histogram on its sort-and-search path,
+    # which on the decimated array beats a bincount over scaled indices
+    bins = np.linspace(-0.2, 1.0, 60)
+    return np.histogram(ndvi_values, bins=bins)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _latest_png(prefix: str, mtime_ns: int):
+    """
+    Bytes of the newest ``<prefix>_*.png`` in the processed directory, or
+    None if there is none. ``mtime_ns`` is the directory's mtime and only
+    keys the cache, so a new pipeline output is picked up on the next rerun.
+    """
+    latest = max(config.PROCESSED_DIR.glob(f"{prefix}_*.png"), default=None)
+    return latest.read_bytes() if latest is not None else None
+
+
 def _stat_card(label, value, color):
     st.markdown(f"""
     <div class="kpi-card">
@@ -8,16 +8,16 @@ import sys
 from pathlib import Path
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
+import orjson
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from dashboard import _plot_theme  # noqa: F401  (default chart template)
 
 
 def render():
     """Render the Overview page."""
-    from database.db_manager import DatabaseManager
-    db = DatabaseManager()
+    from dashboard import db_cache
 
     st.markdown("""
     <h1 style='background: linear-gradient(135deg, #60a5fa, #34d399);
@@ -31,10 +31,11 @@ def render():
     """, unsafe_allow_html=True)
 
     # ── KPI Row ──────────────────────────────────────────────
-    latest_ndvi = db.get_latest_ndvi()
-    latest_health = db.get_latest_health()
-    latest_weather = db.get_latest_weather()
-    pipeline_stats = db.get_pipeline_stats()
+    bundle = db_cache.overview_bundle()
+    latest_ndvi = bundle["ndvi"]
+    latest_health = bundle["health"]
+    latest_weather = bundle["weather"]
+    pipeline_stats = bundle["stats"]
 
     col1, col2, col3, col4, col5 = st.columns(5)
 
@@ -85,8 +86,6 @@ def render():
         )])
         fig.update_layout(
             showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
             margin=dict(t=20, b=20, l=20, r=20),
             height=320,
             annotations=[dict(
@@ -101,40 +100,13 @@ def render():
         st.markdown('<div class="section-header">📈 NDVI Trend</div>',
                     unsafe_allow_html=True)
 
-        ndvi_history = db.get_ndvi_history(limit=20)
+        ndvi_history = db_cache.ndvi_history(limit=20)
         if ndvi_history:
             timestamps = [r.get("timestamp", "")[:16] for r in reversed(ndvi_history)]
-            means = [r.get("ndvi_mean", 0) or 0 for r in reversed(ndvi_history)]
-
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=timestamps, y=means,
-                mode="lines+markers",
-                line=dict(color="#3b82f6", width=3, shape="spline"),
-                marker=dict(size=8, color="#3b82f6",
-                            line=dict(width=2, color="#1e3a5f")),
-                fill="tozeroy",
-                fillcolor="rgba(59,130,246,0.1)",
-                name="NDVI Mean",
-            ))
-            # Threshold lines
-            fig.add_hline(y=0.6, line_dash="dash", line_color="#2ecc71",
-                         annotation_text="Healthy", annotation_position="right")
-            fig.add_hline(y=0.3, line_dash="dash", line_color="#f59e0b",
-                         annotation_text="Moderate", annotation_position="right")
-            fig.add_hline(y=0.1, line_dash="dash", line_color="#e74c3c",
-                         annotation_text="Severe", annotation_position="right")
-
-            fig.update_layout(
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                xaxis=dict(showgrid=False, color="#64748b", tickangle=-45),
-                yaxis=dict(showgrid=True, gridcolor="rgba(100,116,139,0.15)",
-                          color="#64748b", range=[-0.1, 1]),
-                margin=dict(t=20, b=60, l=40, r=80),
-                height=320,
-                showlegend=False,
-            )
+            means = np.fromiter((r.get("ndvi_mean", 0) or 0 for r in reversed(ndvi_history)),
+                                dtype=np.float64, count=len(ndvi_history))
+
+            fig = _ndvi_trend_figure(tuple(timestamps), means)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No NDVI data yet. Run the pipeline first!")
@@ -143,29 +115,29 @@ def render():
     st.markdown('<div class="section-header">🚨 Alerts & Recommendations</div>',
                 unsafe_allow_html=True)
 
-    import json
     alerts_json = latest_health.get("alerts_json", "[]")
     recs_json = latest_health.get("recommendations_json", "[]")
 
     try:
-        alerts = json.loads(alerts_json) if alerts_json else []
-        recommendations = json.loads(recs_json) if recs_json else []
-    except (json.JSONDecodeError, TypeError):
+        alerts = orjson.loads(alerts_json) if alerts_json else []
+        recommendations = orjson.loads(recs_json) if recs_json else []
+    except (orjson.JSONDecodeError, TypeError):
         alerts, recommendations = [], []
 
     acol, rcol = st.columns(2)
     with acol:
         if alerts:
-            for alert in alerts:
-                css_class = "alert-critical" if alert.get("type") == "CRITICAL" else \
-                           "alert-warning" if alert.get("type") == "WARNING" else "alert-info"
-                icon = alert.get("icon", "ℹ️")
-                st.markdown(f"""
-                <div class="{css_class}">
-                    <strong>{icon} {alert.get('title', alert.get('category', 'Alert'))}</strong><br>
-                    <span style='color: #94a3b8; font-size: 0.9rem;'>{alert.get('message', '')}</span>
-                </div>
-                """, unsafe_allow_html=True)
+            # One markdown element for all cards rather than one per alert
+            alert_html = [
+                _ALERT_CARD_TEMPLATE.format(
+                    css_class=_ALERT_CLASSES.get(alert.get("type"), "alert-info"),
+                    icon=alert.get("icon", "ℹ️"),
+                    title=alert.get("title", alert.get("category", "Alert")),
+                    message=alert.get("message", ""),
+                )
+                for alert in alerts
+            ]
+            st.markdown("".join(alert_html), unsafe_allow_html=True)
         else:
             st.markdown("""
             <div class="alert-info">
@@ -175,44 +147,104 @@ def render():
             """, unsafe_allow_html=True)
 
     with rcol:
-        for rec in recommendations[:3]:
-            priority_colors = {"HIGH": "#ef4444", "MEDIUM": "#f59e0b", "LOW": "#2ecc71"}
-            color = priority_colors.get(rec.get("priority", "MEDIUM"), "#3b82f6")
-            st.markdown(f"""
+        rec_html = [
+            _REC_CARD_TEMPLATE.format(
+                color=_PRIORITY_COLORS.get(rec.get("priority", "MEDIUM"), "#3b82f6"),
+                action=rec.get("action", ""),
+                priority=rec.get("priority", ""),
+                detail=rec.get("detail", ""),
+            )
+            for rec in recommendations[:3]
+        ]
+        if rec_html:
+            st.markdown("".join(rec_html), unsafe_allow_html=True)
+
+    # ── Recent Pipeline Activity ─────────────────────────────
+    st.markdown('<div class="section-header">📋 Recent Pipeline Runs</div>',
+                unsafe_allow_html=True)
+
+    runs = db_cache.pipeline_history(limit=5)
+    if runs:
+        run_html = [
+            _RUN_ROW_TEMPLATE.format(
+                icon="✅" if run.get("status") == "completed" else "❌",
+                color="#2ecc71" if run.get("status") == "completed" else "#ef4444",
+                id=run.get("id", "?"),
+                start=run.get("start_time", "")[:16],
+                time_s=run.get("processing_time_s", 0) or 0,
+            )
+            for run in runs
+        ]
+        st.markdown("".join(run_html), unsafe_allow_html=True)
+    else:
+        st.info("No pipeline runs yet. Click '🔄 Run Pipeline' in the sidebar!")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _ndvi_trend_figure(timestamps: tuple, means: np.ndarray) -> go.Figure:
+    """NDVI mean trend with the health threshold lines, oldest first."""
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=means,
+        mode="lines+markers",
+        line=dict(color="#3b82f6", width=3),
+        marker=dict(size=8, color="#3b82f6",
+                    line=dict(width=2, color="#1e3a5f")),
+        fill="tozeroy",
+        fillcolor="rgba(59,130,246,0.1)",
+        name="NDVI Mean",
+    ))
+    # Threshold lines
+    fig.add_hline(y=0.6, line_dash="dash", line_color="#2ecc71",
+                 annotation_text="Healthy", annotation_position="right")
+    fig.add_hline(y=0.3, line_dash="dash", line_color="#f59e0b",
+                 annotation_text="Moderate", annotation_position="right")
+    fig.add_hline(y=0.1, line_dash="dash", line_color="#e74c3c",
+                 annotation_text="Severe", annotation_position="right")
+
+    fig.update_layout(
+        xaxis=dict(tickangle=-45),
+        yaxis=dict(range=[-0.1, 1]),
+        margin=dict(b=60, l=40, r=80),
+        height=320,
+        showlegend=False,
+    )
+    return fig
+
+
+# Card markup for the alert, recommendation and run lists, filled per row
+_ALERT_CLASSES = {"CRITICAL": "alert-critical", "WARNING": "alert-warning"}
+_ALERT_CARD_TEMPLATE = """
+                <div class="{css_class}">
+                    <strong>{icon} {title}</strong><br>
+                    <span style='color: #94a3b8; font-size: 0.9rem;'>{message}</span>
+                </div>
+                """
+
+_PRIORITY_COLORS = {"HIGH": "#ef4444", "MEDIUM": "#f59e0b", "LOW": "#2ecc71"}
+_REC_CARD_TEMPLATE = """
             <div style='background: rgba(26,31,46,0.8); border-radius: 12px;
             padding: 0.8rem 1rem; margin: 0.4rem 0; border-left: 3px solid {color};'>
                 <div style='display: flex; justify-content: space-between;'>
-                    <strong style='color: #f0f4f8;'>{rec.get('action', '')}</strong>
+                    <strong style='color: #f0f4f8;'>{action}</strong>
                     <span class="status-badge" style='background: {color}22; color: {color};'>
-                        {rec.get('priority', '')}
+                        {priority}
                     </span>
                 </div>
-                <span style='color: #94a3b8; font-size: 0.85rem;'>{rec.get('detail', '')}</span>
+                <span style='color: #94a3b8; font-size: 0.85rem;'>{detail}</span>
             </div>
-            """, unsafe_allow_html=True)
+            """
 
-    # ── Recent Pipeline Activity ─────────────────────────────
-    st.markdown('<div class="section-header">📋 Recent Pipeline Runs</div>',
-                unsafe_allow_html=True)
-
-    runs = db.get_pipeline_history(limit=5)
-    if runs:
-        for run in runs:
-            status_color = "#2ecc71" if run.get("status") == "completed" else "#ef4444"
-            status_icon = "✅" if run.get("status") == "completed" else "❌"
-            time_str = run.get("processing_time_s", 0) or 0
-            st.markdown(f"""
+_RUN_ROW_TEMPLATE = """
             <div style='background: rgba(26,31,46,0.6); border-radius: 10px;
             padding: 0.6rem 1rem; margin: 0.3rem 0; display: flex;
             justify-content: space-between; align-items: center;'>
-                <span>{status_icon} Run #{run.get('id', '?')} — {run.get('start_time', '')[:16]}</span>
-                <span style='color: {status_color}; font-family: JetBrains Mono;'>
-                    {time_str:.1f}s
+                <span>{icon} Run #{id} — {start}</span>
+                <span style='color: {color}; font-family: JetBrains Mono;'>
+                    {time_s:.1f}s
                 </span>
             </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.info("No pipeline runs yet. Click '🔄 Run Pipeline' in the sidebar!")
+            """
 
 
 def _kpi_card(label: str, value: str, color: str, subtitle: str):
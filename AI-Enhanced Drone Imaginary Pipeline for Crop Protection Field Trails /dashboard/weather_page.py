@@ -5,7 +5,6 @@ Multi-state & international weather comparison,
 local field conditions, and agricultural alerts.
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -15,7 +14,9 @@ from plotly.subplots import make_subplots
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-import config
+from dashboard import _plot_theme  # noqa: F401  (default chart template)
+from dashboard._colors import soil_colors, temp_colors
+from dashboard._downsample import lttb_indices
 
 
 def render():
@@ -31,9 +32,16 @@ def render():
     </p>
     """, unsafe_allow_html=True)
 
-    from database.db_manager import DatabaseManager
-    from data_ingestion.weather_fetcher import get_multi_location_weather, GLOBAL_LOCATIONS
-    db = DatabaseManager()
+    # Region-dependent sections rerun on their own when the filter changes;
+    # the field history below is independent of it.
+    _regional_weather()
+    _field_history()
+
+
+@st.fragment
+def _regional_weather():
+    """Region filter, cross-region charts, condition cards and advisories."""
+    from dashboard import db_cache
 
     # ── Region Filter ────────────────────────────────────────
     filter_col, refresh_col = st.columns([3, 1])
@@ -52,12 +60,16 @@ def render():
                 # Also update local field weather
                 from data_ingestion.weather_fetcher import fetch_weather
                 weather = fetch_weather()
-                db.insert_weather(weather)
+                db_cache.get_db().insert_weather(weather)
+            # Only the weather queries are stale; chart and NDVI caches stay warm
+            for cached in (db_cache.multi_location_weather, db_cache.weather_trend,
+                           db_cache.latest_weather, db_cache.overview_bundle):
+                cached.clear()
             st.success("✅ Weather updated for all locations!")
             st.rerun()
 
     # ── Load multi-location weather ──────────────────────────
-    multi_wx = get_multi_location_weather()
+    multi_wx = db_cache.multi_location_weather()
 
     # Filter by region
     if region_filter == "🇺🇸 US States":
@@ -69,34 +81,237 @@ def render():
         st.warning("No weather data. Click 'Refresh Weather' to fetch!")
         return
 
-    # ── Temperature Bar Chart (All Locations) ────────────────
-    st.markdown('<div class="section-header">🌡️ Temperature Across Regions</div>',
+    wx_cols = _weather_columns(multi_wx)
+    short_names = np.array([n.split(",")[0] for n in multi_wx])
+    # Color scale: cold=blue, warm=green, hot=red; shared by the bars and cards
+    temp_cols = temp_colors(wx_cols["temp"])
+    # Cross-location charts say nothing for a single location; its card has the values
+    compare = len(multi_wx) > 1
+
+    if compare:
+        # ── Temperature Bar Chart (All Locations) ────────────
+        st.markdown('<div class="section-header">🌡️ Temperature Across Regions</div>',
+                    unsafe_allow_html=True)
+
+        # Sort by temperature, hottest first (ties keep their listed order)
+        order = np.argsort(-wx_cols["temp"], kind="stable")
+        names_s = short_names[order].tolist()
+        temps_s = wx_cols["temp"][order]
+        humids_s = wx_cols["humidity"][order]
+        colors = temp_cols[order].tolist()
+
+        fig = _temperature_figure(tuple(names_s), temps_s, humids_s, tuple(colors))
+        st.plotly_chart(fig, use_container_width=True)
+
+    # ── Weather Cards Grid ───────────────────────────────────
+    st.markdown('<div class="section-header">📋 Detailed Conditions by Location</div>',
                 unsafe_allow_html=True)
 
-    names = list(multi_wx.keys())
-    temps = [multi_wx[n].get("current", {}).get("temperature_c", 0) for n in names]
-    humids = [multi_wx[n].get("current", {}).get("humidity_pct", 0) for n in names]
-
-    # Sort by temperature
-    sorted_pairs = sorted(zip(names, temps, humids), key=lambda x: x[1], reverse=True)
-    names_s = [p[0].split(",")[0] for p in sorted_pairs]  # Short names
-    temps_s = [p[1] for p in sorted_pairs]
-    humids_s = [p[2] for p in sorted_pairs]
-
-    # Color scale: cold=blue, warm=green, hot=red
-    colors = []
-    for t in temps_s:
-        if t > 35:
-            colors.append("#ef4444")
-        elif t > 25:
-            colors.append("#f59e0b")
-        elif t > 10:
-            colors.append("#2ecc71")
-        elif t > 0:
-            colors.append("#3b82f6")
+    # All cards in one markdown element, laid out three per row by CSS grid
+    card_html = []
+    for idx, (name, wx) in enumerate(multi_wx.items()):
+        alerts = wx.get("agricultural_alerts", [])
+        temp = wx_cols["temp"][idx]
+        rain = wx_cols["rain"][idx]
+        clouds = wx_cols["clouds"][idx]
+
+        # Weather icon
+        if rain > 1:
+            wx_icon = "🌧️"
+        elif clouds > 70:
+            wx_icon = "☁️"
+        elif clouds > 30:
+            wx_icon = "⛅"
+        elif temp > 35:
+            wx_icon = "🔥"
+        elif temp < 0:
+            wx_icon = "❄️"
         else:
-            colors.append("#8b5cf6")
+            wx_icon = "☀️"
+
+        # Alert badge
+        alert_badge = ""
+        if alerts:
+            top_alert = alerts[0]
+            atype = top_alert.get("type", "INFO")
+            acolor = "#ef4444" if atype == "CRITICAL" else "#f59e0b" if atype == "WARNING" else "#2ecc71"
+            alert_badge = _CARD_BADGE_TEMPLATE.format(
+                color=acolor, category=top_alert.get("category", "").title()
+            )
+
+        is_active = (name == "Iowa, USA")
+        card_html.append(_WEATHER_CARD_TEMPLATE.format(
+            border_color="#2ecc71" if is_active else "rgba(59,130,246,0.15)",
+            shadow="box-shadow: 0 0 15px rgba(46,204,113,0.15);" if is_active else "",
+            wx_icon=wx_icon,
+            short_name=short_names[idx],
+            active_tag=" 🟢 ACTIVE" if is_active else "",
+            crop=wx.get("crop", ""),
+            temp_color=temp_cols[idx],
+            temp=temp,
+            humidity=wx_cols["humidity"][idx],
+            wind=wx_cols["wind"][idx],
+            soil_m=wx_cols["soil_m"][idx] * 100,
+            rain=rain,
+            soil_t=wx_cols["soil_t"][idx],
+            desc=wx.get("current", {}).get("description", "N/A"),
+            alert_badge=alert_badge,
+        ))
+    st.markdown(
+        "<div style='display: grid; grid-template-columns: repeat(3, minmax(0, 1fr));"
+        " column-gap: 1rem;'>" + "".join(card_html) + "</div>",
+        unsafe_allow_html=True,
+    )
+
+    if compare:
+        # ── Soil Moisture Comparison ─────────────────────────
+        st.markdown('<div class="section-header">🌱 Soil Moisture Comparison</div>',
+                    unsafe_allow_html=True)
+
+        soil_names = short_names.tolist()
+        soil_vals = wx_cols["soil_m"] * 100
+        soil_cols = soil_colors(soil_vals).tolist()
+
+        fig2 = _soil_moisture_figure(tuple(soil_names), soil_vals, tuple(soil_cols))
+        st.plotly_chart(fig2, use_container_width=True)
+
+    # ── Agricultural Alerts (All Locations) ──────────────────
+    st.markdown('<div class="section-header">🚜 Agricultural Advisories</div>',
+                unsafe_allow_html=True)
+
+    all_alerts = []
+    for name, wx in multi_wx.items():
+        for alert in wx.get("agricultural_alerts", []):
+            if alert.get("type") != "INFO":
+                all_alerts.append({"location": name.split(",")[0], **alert})
+
+    if all_alerts:
+        # Sort by severity
+        all_alerts.sort(key=lambda a: a.get("severity", 0), reverse=True)
+        # All advisories in one markdown element, like the condition cards
+        alert_html = []
+        for alert in all_alerts[:8]:
+            critical = alert.get("type", "INFO") == "CRITICAL"
+            alert_html.append(_ADVISORY_TEMPLATE.format(
+                css_class="alert-critical" if critical else "alert-warning",
+                icon="🚨" if critical else "⚠️",
+                location=alert["location"],
+                category=alert.get("category", "").title(),
+                message=alert.get("message", ""),
+            ))
+        st.markdown("".join(alert_html), unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="alert-info">
+            <strong>✅ No Critical Advisories</strong><br>
+            <span style='color: #94a3b8;'>
+                Weather conditions are generally favorable across all monitored regions
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+# Per-location condition card, filled once per location
+_WEATHER_CARD_TEMPLATE = (
+    "<div style='background: linear-gradient(145deg, #1a1f2e, #222838);"
+    "border-radius: 14px; padding: 1rem; margin-bottom: 0.6rem;"
+    "border: 1px solid {border_color}; {shadow}'>"
+    "<table style='width:100%; border:none; border-collapse:collapse;'>"
+    "<tr><td style='border:none; padding:2px;'>"
+    "<strong style='color:#f0f4f8; font-size:0.95rem;'>{wx_icon} {short_name}{active_tag}</strong>"
+    "<br><span style='color:#64748b; font-size:0.7rem;'>🌾 {crop}</span>"
+    "</td>"
+    "<td style='border:none; text-align:right; vertical-align:top; padding:2px;'>"
+    "<span style='color:{temp_color}; font-size:1.6rem; font-weight:800;"
+    "font-family:JetBrains Mono;'>{temp:.0f}°</span>"
+    "</td></tr>"
+    "</table>"
+    "<table style='width:100%; border:none; border-collapse:collapse;"
+    "margin-top:6px; font-size:0.78rem; color:#94a3b8;'>"
+    "<tr>"
+    "<td style='border:none; padding:2px;'>💧 {humidity:.0f}%</td>"
+    "<td style='border:none; padding:2px;'>💨 {wind:.1f} m/s</td>"
+    "</tr><tr>"
+    "<td style='border:none; padding:2px;'>🌱 {soil_m:.0f}%</td>"
+    "<td style='border:none; padding:2px;'>🌧️ {rain:.1f} mm</td>"
+    "</tr><tr>"
+    "<td style='border:none; padding:2px;'>🌍 {soil_t:.0f}°C soil</td>"
+    "<td style='border:none; padding:2px;'>☁️ {desc}</td>"
+    "</tr>"
+    "</table>"
+    "{alert_badge}"
+    "</div>"
+)
+
+_ADVISORY_TEMPLATE = """
+            <div class="{css_class}">
+                <strong>{icon} {location} — {category}</strong><br>
+                <span style='color: #94a3b8;'>{message}</span>
+            </div>
+            """
+
+_CARD_BADGE_TEMPLATE = """<span style='display:inline-block; background:{color}22;
+                        color:{color}; padding: 2px 8px; border-radius:6px;
+                        font-size: 0.7rem; margin-top: 4px;'>
+                        {category}</span>"""
+
+# Numeric per-location readings, as (section, field) in each weather dict
+_WEATHER_FIELDS = {
+    "temp": ("current", "temperature_c"),
+    "humidity": ("current", "humidity_pct"),
+    "wind": ("current", "wind_speed_ms"),
+    "clouds": ("current", "cloud_cover_pct"),
+    "rain": ("precipitation", "rain_mm"),
+    "soil_m": ("soil", "moisture"),
+    "soil_t": ("soil", "temperature_c"),
+}
+
+
+def _weather_columns(multi_wx: dict) -> dict:
+    """One float array per reading in _WEATHER_FIELDS, in location order."""
+    n = len(multi_wx)
+    columns = {key: np.empty(n) for key in _WEATHER_FIELDS}
+    for i, wx in enumerate(multi_wx.values()):
+        for key, (section, field) in _WEATHER_FIELDS.items():
+            columns[key][i] = wx.get(section, {}).get(field, 0)
+    return columns
+
+
+def _field_history():
+    """Historical temperature, humidity and soil trends for the field."""
+    from dashboard import db_cache
+
+    # ── Local Field History ──────────────────────────────────
+    st.markdown('<div class="section-header">📈 Iowa Field — Historical Trends</div>',
+                unsafe_allow_html=True)
+
+    # Columns already oldest first, nulls as 0. The whole history; the
+    # figures downsample it to _MAX_TREND_POINTS.
+    trend = db_cache.weather_trend(limit=None)
+    timestamps = tuple(trend["timestamp"])
+
+    if timestamps:
+        chart_left, chart_right = st.columns(2)
+
+        with chart_left:
+            temp_h = np.asarray(trend["temperature_c"], dtype=float)
+            humid_h = np.asarray(trend["humidity_pct"], dtype=float)
+
+            fig3 = _field_temperature_figure(timestamps, temp_h, humid_h)
+            st.plotly_chart(fig3, use_container_width=True)
+
+        with chart_right:
+            soil_m_h = np.asarray(trend["soil_moisture"], dtype=float)
+            soil_t_h = np.asarray(trend["soil_temp_c"], dtype=float)
+
+            fig4 = _field_soil_figure(timestamps, soil_m_h, soil_t_h)
+            st.plotly_chart(fig4, use_container_width=True)
+
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def _temperature_figure(names_s: tuple, temps_s: np.ndarray, humids_s: np.ndarray,
+                        colors: tuple) -> go.Figure:
+    """Temperature bars and humidity line across locations, hottest first."""
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(go.Bar(
         x=names_s, y=temps_s,
@@ -118,262 +333,113 @@ def render():
     ), secondary_y=True)
 
     fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        xaxis=dict(color="#64748b", showgrid=False, tickangle=-45),
-        margin=dict(t=30, b=80, l=50, r=50),
+        xaxis=dict(tickangle=-45),
+        margin=dict(t=30, b=80, r=50),
         height=350,
-        legend=dict(orientation="h", y=-0.3, x=0.5, xanchor="center",
-                   font=dict(color="#94a3b8")),
+        legend=dict(orientation="h", y=-0.3, x=0.5, xanchor="center"),
         showlegend=True,
     )
     fig.update_yaxes(title_text="°C", color="#ef4444", showgrid=True,
                     gridcolor="rgba(100,116,139,0.1)", secondary_y=False)
     fig.update_yaxes(title_text="%", color="#3b82f6", showgrid=False, secondary_y=True)
-    st.plotly_chart(fig, use_container_width=True)
-
-    # ── Weather Cards Grid ───────────────────────────────────
-    st.markdown('<div class="section-header">📋 Detailed Conditions by Location</div>',
-                unsafe_allow_html=True)
+    return fig
 
-    # Display in rows of 3
-    items = list(multi_wx.items())
-    for row_start in range(0, len(items), 3):
-        row_items = items[row_start:row_start + 3]
-        cols = st.columns(3)
-        for idx, (name, wx) in enumerate(row_items):
-            with cols[idx]:
-                current = wx.get("current", {})
-                soil = wx.get("soil", {})
-                precip = wx.get("precipitation", {})
-                alerts = wx.get("agricultural_alerts", [])
-                crop = wx.get("crop", "")
-
-                temp = current.get("temperature_c", 0)
-                humidity = current.get("humidity_pct", 0)
-                desc = current.get("description", "N/A")
-                wind = current.get("wind_speed_ms", 0)
-                clouds = current.get("cloud_cover_pct", 0)
-                rain = precip.get("rain_mm", 0)
-                soil_m = soil.get("moisture", 0)
-                soil_t = soil.get("temperature_c", 0)
-
-                # Weather icon
-                if rain > 1:
-                    wx_icon = "🌧️"
-                elif clouds > 70:
-                    wx_icon = "☁️"
-                elif clouds > 30:
-                    wx_icon = "⛅"
-                elif temp > 35:
-                    wx_icon = "🔥"
-                elif temp < 0:
-                    wx_icon = "❄️"
-                else:
-                    wx_icon = "☀️"
-
-                # Temperature color
-                if temp > 35:
-                    tc = "#ef4444"
-                elif temp > 25:
-                    tc = "#f59e0b"
-                elif temp > 10:
-                    tc = "#2ecc71"
-                elif temp > 0:
-                    tc = "#3b82f6"
-                else:
-                    tc = "#8b5cf6"
-
-                # Alert badge
-                alert_badge = ""
-                if alerts:
-                    top_alert = alerts[0]
-                    atype = top_alert.get("type", "INFO")
-                    acolor = "#ef4444" if atype == "CRITICAL" else "#f59e0b" if atype == "WARNING" else "#2ecc71"
-                    alert_badge = f"""<span style='display:inline-block; background:{acolor}22;
-                        color:{acolor}; padding: 2px 8px; border-radius:6px;
-                        font-size: 0.7rem; margin-top: 4px;'>
-                        {top_alert.get('category','').title()}</span>"""
-
-                is_active = (name == "Iowa, USA")
-                border_color = "#2ecc71" if is_active else "rgba(59,130,246,0.15)"
-                active_tag = " 🟢 ACTIVE" if is_active else ""
-                shadow = "box-shadow: 0 0 15px rgba(46,204,113,0.15);" if is_active else ""
-                short_name = name.split(",")[0]
-                soil_m_pct = f"{soil_m * 100:.0f}%"
-
-                card_html = (
-                    f"<div style='background: linear-gradient(145deg, #1a1f2e, #222838);"
-                    f"border-radius: 14px; padding: 1rem; margin-bottom: 0.6rem;"
-                    f"border: 1px solid {border_color}; {shadow}'>"
-                    f"<table style='width:100%; border:none; border-collapse:collapse;'>"
-                    f"<tr><td style='border:none; padding:2px;'>"
-                    f"<strong style='color:#f0f4f8; font-size:0.95rem;'>{wx_icon} {short_name}{active_tag}</strong>"
-                    f"<br><span style='color:#64748b; font-size:0.7rem;'>🌾 {crop}</span>"
-                    f"</td>"
-                    f"<td style='border:none; text-align:right; vertical-align:top; padding:2px;'>"
-                    f"<span style='color:{tc}; font-size:1.6rem; font-weight:800;"
-                    f"font-family:JetBrains Mono;'>{temp:.0f}°</span>"
-                    f"</td></tr>"
-                    f"</table>"
-                    f"<table style='width:100%; border:none; border-collapse:collapse;"
-                    f"margin-top:6px; font-size:0.78rem; color:#94a3b8;'>"
-                    f"<tr>"
-                    f"<td style='border:none; padding:2px;'>💧 {humidity:.0f}%</td>"
-                    f"<td style='border:none; padding:2px;'>💨 {wind:.1f} m/s</td>"
-                    f"</tr><tr>"
-                    f"<td style='border:none; padding:2px;'>🌱 {soil_m_pct}</td>"
-                    f"<td style='border:none; padding:2px;'>🌧️ {rain:.1f} mm</td>"
-                    f"</tr><tr>"
-                    f"<td style='border:none; padding:2px;'>🌍 {soil_t:.0f}°C soil</td>"
-                    f"<td style='border:none; padding:2px;'>☁️ {desc}</td>"
-                    f"</tr>"
-                    f"</table>"
-                    f"{alert_badge}"
-                    f"</div>"
-                )
-                st.markdown(card_html, unsafe_allow_html=True)
-
-    # ── Soil Moisture Comparison ─────────────────────────────
-    st.markdown('<div class="section-header">🌱 Soil Moisture Comparison</div>',
-                unsafe_allow_html=True)
 
-    soil_names = [n.split(",")[0] for n in multi_wx.keys()]
-    soil_vals = [multi_wx[n].get("soil", {}).get("moisture", 0) * 100 for n in multi_wx]
-
-    soil_colors = []
-    for s in soil_vals:
-        if s < 20:
-            soil_colors.append("#ef4444")
-        elif s < 35:
-            soil_colors.append("#f59e0b")
-        else:
-            soil_colors.append("#2ecc71")
-
-    fig2 = go.Figure()
-    fig2.add_trace(go.Bar(
+@st.cache_data(max_entries=8, show_spinner=False)
+def _soil_moisture_figure(soil_names: tuple, soil_vals: np.ndarray,
+                          bar_colors: tuple) -> go.Figure:
+    """Soil moisture bars per location with the drought and waterlogging lines."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
         x=soil_names, y=soil_vals,
-        marker=dict(color=soil_colors, line=dict(width=0)),
+        marker=dict(color=bar_colors, line=dict(width=0)),
         text=[f"{s:.0f}%" for s in soil_vals],
         textposition="outside",
         textfont=dict(color="white", size=11),
         hovertemplate="%{x}: %{y:.1f}%<extra></extra>",
     ))
 
-    fig2.add_hline(y=20, line_dash="dash", line_color="rgba(239,68,68,0.6)",
+    fig.add_hline(y=20, line_dash="dash", line_color="rgba(239,68,68,0.6)",
                   annotation_text="Drought Risk", annotation_font_color="#ef4444")
-    fig2.add_hline(y=80, line_dash="dash", line_color="rgba(59,130,246,0.6)",
+    fig.add_hline(y=80, line_dash="dash", line_color="rgba(59,130,246,0.6)",
                   annotation_text="Waterlogged", annotation_font_color="#3b82f6")
 
-    fig2.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        xaxis=dict(color="#64748b", showgrid=False, tickangle=-45),
-        yaxis=dict(title="Soil Moisture %", color="#64748b",
-                  showgrid=True, gridcolor="rgba(100,116,139,0.1)"),
-        margin=dict(t=30, b=80, l=50, r=30),
+    fig.update_layout(
+        xaxis=dict(tickangle=-45),
+        yaxis=dict(title="Soil Moisture %", gridcolor="rgba(100,116,139,0.1)"),
+        margin=dict(t=30, b=80),
         height=300,
         showlegend=False,
     )
-    st.plotly_chart(fig2, use_container_width=True)
+    return fig
 
-    # ── Local Field History ──────────────────────────────────
-    st.markdown('<div class="section-header">📈 Iowa Field — Historical Trends</div>',
-                unsafe_allow_html=True)
 
-    history = db.get_weather_history(limit=24)
+# Longer field histories are downsampled to this many points before plotting
+_MAX_TREND_POINTS = 500
 
-    if history:
-        chart_left, chart_right = st.columns(2)
 
-        with chart_left:
-            timestamps = [h.get("timestamp", "")[:16] for h in reversed(history)]
-            temp_h = [h.get("temperature_c", 0) or 0 for h in reversed(history)]
-            humid_h = [h.get("humidity_pct", 0) or 0 for h in reversed(history)]
-
-            fig3 = make_subplots(specs=[[{"secondary_y": True}]])
-            fig3.add_trace(go.Scatter(
-                x=timestamps, y=temp_h, name="Temperature",
-                line=dict(color="#ef4444", width=3), mode="lines",
-                fill="tozeroy", fillcolor="rgba(239,68,68,0.08)",
-            ), secondary_y=False)
-            fig3.add_trace(go.Scatter(
-                x=timestamps, y=humid_h, name="Humidity",
-                line=dict(color="#3b82f6", width=2, dash="dot"), mode="lines",
-            ), secondary_y=True)
-
-            fig3.update_layout(
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=20, b=60, l=50, r=50), height=280,
-                legend=dict(orientation="h", y=-0.25, x=0.5, xanchor="center",
-                           font=dict(color="#94a3b8")),
-                xaxis=dict(showgrid=False, color="#64748b", tickangle=-45),
-            )
-            fig3.update_yaxes(title_text="°C", color="#ef4444", secondary_y=False,
-                            showgrid=True, gridcolor="rgba(100,116,139,0.1)")
-            fig3.update_yaxes(title_text="%", color="#3b82f6", secondary_y=True, showgrid=False)
-            st.plotly_chart(fig3, use_container_width=True)
+def _trend_points(timestamps: tuple, primary: np.ndarray, secondary: np.ndarray):
+    """
+    Cap a two-series history at _MAX_TREND_POINTS, choosing the points by
+    LTTB on the primary series and keeping the same instants of the other.
+    """
+    if primary.size <= _MAX_TREND_POINTS:
+        return timestamps, primary, secondary
+    keep = lttb_indices(primary, _MAX_TREND_POINTS)
+    return tuple(timestamps[i] for i in keep), primary[keep], secondary[keep]
 
-        with chart_right:
-            soil_m_h = [h.get("soil_moisture", 0) or 0 for h in reversed(history)]
-            soil_t_h = [h.get("soil_temp_c", 0) or 0 for h in reversed(history)]
-
-            fig4 = make_subplots(specs=[[{"secondary_y": True}]])
-            fig4.add_trace(go.Scatter(
-                x=timestamps, y=[s * 100 for s in soil_m_h], name="Soil Moisture",
-                line=dict(color="#2ecc71", width=3), mode="lines",
-                fill="tozeroy", fillcolor="rgba(46,204,113,0.08)",
-            ), secondary_y=False)
-            fig4.add_trace(go.Scatter(
-                x=timestamps, y=soil_t_h, name="Soil Temp",
-                line=dict(color="#f59e0b", width=2, dash="dot"), mode="lines",
-            ), secondary_y=True)
-            fig4.add_hline(y=20, line_dash="dash", line_color="rgba(239,68,68,0.5)",
-                         annotation_text="Drought", secondary_y=False)
-
-            fig4.update_layout(
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=20, b=60, l=50, r=50), height=280,
-                legend=dict(orientation="h", y=-0.25, x=0.5, xanchor="center",
-                           font=dict(color="#94a3b8")),
-                xaxis=dict(showgrid=False, color="#64748b", tickangle=-45),
-            )
-            fig4.update_yaxes(title_text="%", color="#2ecc71", secondary_y=False,
-                            showgrid=True, gridcolor="rgba(100,116,139,0.1)")
-            fig4.update_yaxes(title_text="°C", color="#f59e0b", secondary_y=True, showgrid=False)
-            st.plotly_chart(fig4, use_container_width=True)
 
-    # ── Agricultural Alerts (All Locations) ──────────────────
-    st.markdown('<div class="section-header">🚜 Agricultural Advisories</div>',
-                unsafe_allow_html=True)
+@st.cache_data(max_entries=8, show_spinner=False)
+def _field_temperature_figure(timestamps: tuple, temp_h: np.ndarray,
+                              humid_h: np.ndarray) -> go.Figure:
+    """Field air temperature and humidity history, oldest first."""
+    timestamps, temp_h, humid_h = _trend_points(timestamps, temp_h, humid_h)
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=temp_h, name="Temperature",
+        line=dict(color="#ef4444", width=3), mode="lines",
+        fill="tozeroy", fillcolor="rgba(239,68,68,0.08)",
+    ), secondary_y=False)
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=humid_h, name="Humidity",
+        line=dict(color="#3b82f6", width=2, dash="dot"), mode="lines",
+    ), secondary_y=True)
 
-    all_alerts = []
-    for name, wx in multi_wx.items():
-        for alert in wx.get("agricultural_alerts", []):
-            if alert.get("type") != "INFO":
-                all_alerts.append({"location": name.split(",")[0], **alert})
+    fig.update_layout(
+        margin=dict(b=60, r=50), height=280,
+        legend=dict(orientation="h", y=-0.25, x=0.5, xanchor="center"),
+        xaxis=dict(tickangle=-45),
+    )
+    fig.update_yaxes(title_text="°C", color="#ef4444", secondary_y=False,
+                    showgrid=True, gridcolor="rgba(100,116,139,0.1)")
+    fig.update_yaxes(title_text="%", color="#3b82f6", secondary_y=True, showgrid=False)
+    return fig
 
-    if all_alerts:
-        # Sort by severity
-        all_alerts.sort(key=lambda a: a.get("severity", 0), reverse=True)
-        for alert in all_alerts[:8]:
-            atype = alert.get("type", "INFO")
-            css = "alert-critical" if atype == "CRITICAL" else "alert-warning"
-            icon = "🚨" if atype == "CRITICAL" else "⚠️"
-            st.markdown(f"""
-            <div class="{css}">
-                <strong>{icon} {alert['location']} — {alert.get('category', '').title()}</strong><br>
-                <span style='color: #94a3b8;'>{alert.get('message', '')}</span>
-            </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.markdown("""
-        <div class="alert-info">
-            <strong>✅ No Critical Advisories</strong><br>
-            <span style='color: #94a3b8;'>
-                Weather conditions are generally favorable across all monitored regions
-            </span>
-        </div>
-        """, unsafe_allow_html=True)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _field_soil_figure(timestamps: tuple, soil_m_h: np.ndarray,
+                       soil_t_h: np.ndarray) -> go.Figure:
+    """Field soil moisture and soil temperature history, oldest first."""
+    timestamps, soil_m_h, soil_t_h = _trend_points(timestamps, soil_m_h, soil_t_h)
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=soil_m_h * 100, name="Soil Moisture",
+        line=dict(color="#2ecc71", width=3), mode="lines",
+        fill="tozeroy", fillcolor="rgba(46,204,113,0.08)",
+    ), secondary_y=False)
+    fig.add_trace(go.Scattergl(
+        x=timestamps, y=soil_t_h, name="Soil Temp",
+        line=dict(color="#f59e0b", width=2, dash="dot"), mode="lines",
+    ), secondary_y=True)
+    fig.add_hline(y=20, line_dash="dash", line_color="rgba(239,68,68,0.5)",
+                 annotation_text="Drought", secondary_y=False)
+
+    fig.update_layout(
+        margin=dict(b=60, r=50), height=280,
+        legend=dict(orientation="h", y=-0.25, x=0.5, xanchor="center"),
+        xaxis=dict(tickangle=-45),
+    )
+    fig.update_yaxes(title_text="%", color="#2ecc71", secondary_y=False,
+                    showgrid=True, gridcolor="rgba(100,116,139,0.1)")
+    fig.update_yaxes(title_text="°C", color="#f59e0b", secondary_y=True, showgrid=False)
+    return fig
@@ -7,13 +7,25 @@ Monitors for new imagery and orchestrates the full processing pipeline.
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
+# Project modules load their heavy dependencies (rasterio, scikit-image)
+# inside the functions that use them, so importing them here stays cheap
+from ai_models.health_classifier import classify_health_array
+from ai_models.segmentation import plots_to_geojson, segment_plots_array
+from data_ingestion.sentinel_fetcher import fetch_sentinel_imagery
+from data_ingestion.weather_fetcher import fetch_weather
+from database.db_manager import DatabaseManager
+from processing.geo_processor import create_rgb_composite
+from processing.ndvi_calculator import calculate_ndvi, ndvi_to_rgb
 
 
 def run_pipeline(image_path: str = None) -> dict:
@@ -26,54 +38,59 @@ def run_pipeline(image_path: str = None) -> dict:
     Returns:
         dict with pipeline results and timing.
     """
-    from database.db_manager import DatabaseManager
-    from data_ingestion.sentinel_fetcher import fetch_sentinel_imagery
-    from data_ingestion.weather_fetcher import fetch_weather
-    from processing.ndvi_calculator import calculate_ndvi, ndvi_to_rgb
-    from processing.geo_processor import create_rgb_composite
-    from ai_models.health_classifier import classify_health
-    from ai_models.segmentation import segment_plots, plots_to_geojson
-    import json
-
     db = DatabaseManager()
     run_id = db.start_pipeline_run()
     start_time = time.time()
 
     try:
-        # Step 1: Ingest
-        if image_path:
-            metadata = {
-                "file_path": image_path,
-                "source": "upload",
-                "timestamp": datetime.utcnow().isoformat(),
-                "bbox": config.FIELD_BBOX,
-                "crs": "EPSG:4326",
-                "bands": ["B02", "B03", "B04", "B08"],
-                "size_px": config.IMAGE_SIZE_PX,
-            }
-        else:
-            metadata = fetch_sentinel_imagery()
-        img_id = db.insert_imagery(metadata)
-
-        # Step 2: Weather
-        weather = fetch_weather()
-        db.insert_weather(weather)
-
-        # Step 3: NDVI
-        ndvi_result = calculate_ndvi(metadata["file_path"])
-        ndvi_id = db.insert_ndvi_result(img_id, ndvi_result)
-        ndvi_to_rgb(ndvi_result["output_file"])
-        create_rgb_composite(metadata["file_path"])
-
-        # Step 4: Classify & Segment
-        classification = classify_health(ndvi_result["output_file"], weather)
-        db.insert_health_assessment(ndvi_id, classification)
-
-        segmentation = segment_plots(ndvi_result["output_file"])
-        geojson = plots_to_geojson(segmentation)
-        geojson_path = config.PROCESSED_DIR / "plots.geojson"
-        with open(geojson_path, "w") as f:
-            json.dump(geojson, f, indent=2)
+        # Independent steps overlap on the pool: the weather fetch with the
+        # imagery ingest, the preview images with the analysis, and health
+        # classification with plot segmentation. Database writes stay on this
+        # thread, in step order.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            weather_future = pool.submit(fetch_weather)
+
+            # Step 1: Ingest
+            if image_path:
+                metadata = {
+                    "file_path": image_path,
+                    "source": "upload",
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "bbox": config.FIELD_BBOX,
+                    "crs": "EPSG:4326",
+                    "bands": ["B02", "B03", "B04", "B08"],
+                    "size_px": config.IMAGE_SIZE_PX,
+                }
+            else:
+                metadata = fetch_sentinel_imagery()
+            img_id = db.insert_imagery(metadata)
+
+            # Step 2: Weather
+            weather = weather_future.result()
+            db.insert_weather(weather)
+
+            # Step 3: NDVI (nothing downstream reads the preview images)
+            # The band is kept in memory for the preview and the analysis
+            ndvi_result = calculate_ndvi(metadata["file_path"], return_array=True)
+            ndvi_id = db.insert_ndvi_result(img_id, ndvi_result)
+            ndvi = ndvi_result["array"]
+            previews = [
+                pool.submit(ndvi_to_rgb, ndvi_result["output_file"], array=ndvi),
+                pool.submit(create_rgb_composite, metadata["file_path"]),
+            ]
+
+            # Step 4: Classify & Segment
+            classification, segmentation = _analyze_ndvi(
+                ndvi_result["output_file"], weather, pool, ndvi=ndvi
+            )
+            db.insert_health_assessment(ndvi_id, classification)
+
+            geojson = plots_to_geojson(segmentation)
+            geojson_path = config.PROCESSED_DIR / "plots.geojson"
+            geojson_path.write_bytes(orjson.dumps(geojson, option=orjson.OPT_SERIALIZE_NUMPY))
+
+            for preview in previews:
+                preview.result()
 
         # Complete
         elapsed = time.time() - start_time
@@ -100,6 +117,41 @@ def run_pipeline(image_path: str = None) -> dict:
         logger.error(f"Pipeline failed: {e}")
         return {"status": "failed", "error": str(e), "run_id": run_id}
 
+    finally:
+        db.close()
+
+
+def _analyze_ndvi(ndvi_path: str, weather: dict, pool=None, ndvi=None) -> tuple:
+    """
+    Classify health and segment plots from a single read of the NDVI raster,
+    or none when the band is passed in as ``ndvi``. With an executor
+    ``pool``, classification runs on it alongside segmentation.
+
+    Returns:
+        (classification, segmentation) as produced by classify_health and
+        segment_plots.
+    """
+    import rasterio
+
+    with rasterio.Env(GDAL_CACHEMAX=64, VSI_CACHE=True):
+        with rasterio.open(ndvi_path, sharing=False) as src:
+            if ndvi is None:
+                ndvi = src.read(1, out_dtype="float32")
+            transform = src.transform
+            crs = str(src.crs)
+
+    if pool is None:
+        classification = classify_health_array(ndvi, weather, source_file=str(ndvi_path))
+        segmentation = segment_plots_array(ndvi, transform, crs, source_file=str(ndvi_path))
+        return classification, segmentation
+
+    # Both only read the band, so it can be shared between threads
+    classification = pool.submit(
+        classify_health_array, ndvi, weather, source_file=str(ndvi_path)
+    )
+    segmentation = segment_plots_array(ndvi, transform, crs, source_file=str(ndvi_path))
+    return classification.result(), segmentation
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
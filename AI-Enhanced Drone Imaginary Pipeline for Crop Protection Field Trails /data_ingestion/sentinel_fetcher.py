@@ -8,6 +8,7 @@ Falls back to synthetic imagery generation when API keys are unavailable.
 import json
 import logging
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -20,6 +21,28 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 
 
+def _bilinear_upsample(grid: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+    Bilinearly resize a 2-D grid to ``shape`` with corners aligned, as
+    ``scipy.ndimage.zoom(order=1)`` does, as two separable gather + lerp passes.
+    """
+    def _axis(n_in, n_out):
+        pos = np.arange(n_out) * ((n_in - 1) / max(n_out - 1, 1))
+        i0 = np.minimum(pos.astype(np.intp), n_in - 2)
+        return i0, pos - i0
+
+    y0, fy = _axis(grid.shape[0], shape[0])
+    x0, fx = _axis(grid.shape[1], shape[1])
+    fy = fy[:, None]
+    # Widen the small grid first (strided column gathers stay cheap), then
+    # expand it row-wise, where gathers copy whole contiguous rows
+    cols = grid[:, x0] * (1 - fx) + grid[:, x0 + 1] * fx
+    out = cols[y0]
+    out *= 1 - fy
+    out += cols[y0 + 1] * fy
+    return out
+
+
 def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
     """
     Generate a realistic synthetic 4-band GeoTIFF simulating Sentinel-2.
@@ -29,7 +52,10 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
     from rasterio.transform import from_bounds
     from rasterio.crs import CRS
 
-    np.random.seed(seed)
+    # Own PCG64 generator instead of the global one, so this can run alongside
+    # the synthetic weather generator in another thread; its normal sampler is
+    # also much faster than the legacy one for the full-size noise fields
+    rng = np.random.default_rng(seed)
     size = config.IMAGE_SIZE_PX
 
     # Create realistic crop field patterns using Perlin-like noise
@@ -42,11 +68,8 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
             # Simple interpolated noise
             grid_h = max(2, int(shape[0] * freq / shape[0] * 8))
             grid_w = max(2, int(shape[1] * freq / shape[1] * 8))
-            noise = np.random.randn(grid_h, grid_w)
-            # Bilinear upsample
-            from scipy.ndimage import zoom
-            zoomed = zoom(noise, (shape[0] / grid_h, shape[1] / grid_w), order=1)
-            result += zoomed[:shape[0], :shape[1]] * amp
+            noise = rng.standard_normal((grid_h, grid_w))
+            result += _bilinear_upsample(noise, shape) * amp
             freq *= 2.0
             amp *= persistence
         # Normalize to [0, 1]
@@ -66,14 +89,17 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
 
     # Add some random "plots" with varying health
     plot_health = np.ones((size, size))
-    n_plots = np.random.randint(4, 8)
+    n_plots = rng.integers(4, 8)
     for _ in range(n_plots):
-        cx, cy = np.random.randint(50, size - 50, 2)
-        radius = np.random.randint(30, 80)
-        Y, X = np.ogrid[:size, :size]
+        cx, cy = rng.integers(50, size - 50, 2)
+        radius = rng.integers(30, 80)
+        # Only the plot's bounding box can fall inside the circle
+        y0, y1 = max(cy - radius, 0), min(cy + radius + 1, size)
+        x0, x1 = max(cx - radius, 0), min(cx + radius + 1, size)
+        Y, X = np.ogrid[y0:y1, x0:x1]
         mask = ((X - cx) ** 2 + (Y - cy) ** 2) < radius ** 2
-        health_factor = np.random.uniform(0.3, 1.0)
-        plot_health[mask] = health_factor
+        health_factor = rng.uniform(0.3, 1.0)
+        plot_health[y0:y1, x0:x1][mask] = health_factor
 
     # Combine patterns for vegetation density
     vegetation = base_pattern * 0.4 + row_pattern * 0.3 + 0.3
@@ -82,19 +108,14 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
 
     # Generate reflectance bands (simulating real Sentinel-2 values)
     # Healthy vegetation: low red, high NIR
-    blue = (0.03 + 0.05 * (1 - vegetation) + np.random.normal(0, 0.005, (size, size))).clip(0.01, 0.3)
-    green = (0.05 + 0.08 * vegetation + np.random.normal(0, 0.005, (size, size))).clip(0.01, 0.3)
-    red = (0.03 + 0.12 * (1 - vegetation) + np.random.normal(0, 0.005, (size, size))).clip(0.01, 0.3)
-    nir = (0.15 + 0.45 * vegetation + np.random.normal(0, 0.01, (size, size))).clip(0.05, 0.7)
-
-    # Scale to uint16 (0-10000 like Sentinel-2 L2A)
-    scale = 10000
-    bands = np.stack([
-        (blue * scale).astype(np.uint16),
-        (green * scale).astype(np.uint16),
-        (red * scale).astype(np.uint16),
-        (nir * scale).astype(np.uint16),
-    ])
+    bare = 1 - vegetation
+    band_specs = [
+        # (description, offset, gain, driver, noise sigma, clip low, clip high)
+        ("Blue (B02)", 0.03, 0.05, bare, 0.005, 0.01, 0.3),
+        ("Green (B03)", 0.05, 0.08, vegetation, 0.005, 0.01, 0.3),
+        ("Red (B04)", 0.03, 0.12, bare, 0.005, 0.01, 0.3),
+        ("NIR (B08)", 0.15, 0.45, vegetation, 0.01, 0.05, 0.7),
+    ]
 
     # Create GeoTIFF
     bbox = config.FIELD_BBOX
@@ -112,15 +133,32 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
         "crs": CRS.from_epsg(4326),
         "transform": transform,
         "compress": "deflate",
+        # Horizontal differencing shrinks the smooth uint16 bands under deflate,
+        # and band interleaving lets readers decode only the bands they read
+        "predictor": 2,
+        "interleave": "band",
+        "num_threads": "ALL_CPUS",
     }
 
+    # Scale to uint16 (0-10000 like Sentinel-2 L2A) and write band by band,
+    # so only one band is ever held, in buffers reused across the bands
+    scale = 10000
+    band = np.empty((size, size), dtype=np.uint16)
+    signal = np.empty((size, size))
+    noise = np.empty((size, size))
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with rasterio.open(str(output_path), "w", **profile) as dst:
-        dst.write(bands)
-        dst.set_band_description(1, "Blue (B02)")
-        dst.set_band_description(2, "Green (B03)")
-        dst.set_band_description(3, "Red (B04)")
-        dst.set_band_description(4, "NIR (B08)")
+    with rasterio.open(output_path, "w", **profile) as dst:
+        for index, (description, offset, gain, driver, sigma, lo, hi) in enumerate(band_specs, 1):
+            rng.standard_normal(out=noise)
+            noise *= sigma
+            np.multiply(driver, gain, out=signal)
+            signal += offset
+            noise += signal
+            np.clip(noise, lo, hi, out=noise)
+            noise *= scale
+            np.copyto(band, noise, casting="unsafe")
+            dst.write(band, index)
+            dst.set_band_description(index, description)
         dst.update_tags(
             source="synthetic",
             generated=datetime.utcnow().isoformat(),
@@ -144,6 +182,42 @@ def _generate_synthetic_sentinel(output_path: Path, seed: int = 42) -> dict:
     return metadata
 
 
+# Sentinel Hub access token and its expiry (epoch seconds), shared across fetches
+_token_cache = {"token": None, "expires_at": 0.0}
+# Seconds before expiry at which a cached token is no longer handed out
+_TOKEN_EXPIRY_MARGIN = 60
+_session = None
+# Bytes per write when streaming a Process API response to disk
+_DOWNLOAD_CHUNK_BYTES = 1 << 16
+
+
+def _http_session():
+    """One keep-alive HTTP session per process for the Sentinel Hub calls."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+def _sentinel_token(session) -> str:
+    """OAuth2 client-credentials token, fetched only when the cached one is near expiry."""
+    if _token_cache["token"] and time.time() < _token_cache["expires_at"] - _TOKEN_EXPIRY_MARGIN:
+        return _token_cache["token"]
+
+    token_url = "https://services.sentinel-hub.com/oauth/token"
+    token_resp = session.post(token_url, data={
+        "grant_type": "client_credentials",
+        "client_id": config.SENTINEL_HUB_CLIENT_ID,
+        "client_secret": config.SENTINEL_HUB_CLIENT_SECRET,
+    })
+    token_resp.raise_for_status()
+    payload = token_resp.json()
+    _token_cache["token"] = payload["access_token"]
+    _token_cache["expires_at"] = time.time() + payload.get("expires_in", 3600)
+    return _token_cache["token"]
+
+
 def fetch_sentinel_imagery(
     bbox: dict = None,
     date_from: str = None,
@@ -170,18 +244,10 @@ def fetch_sentinel_imagery(
         return _generate_synthetic_sentinel(output_path, seed=hash(timestamp) % 10000)
 
     # ── Live Sentinel Hub API fetch ──────────────────────────
-    import requests
-
     try:
-        # Step 1: Get OAuth2 token
-        token_url = "https://services.sentinel-hub.com/oauth/token"
-        token_resp = requests.post(token_url, data={
-            "grant_type": "client_credentials",
-            "client_id": config.SENTINEL_HUB_CLIENT_ID,
-            "client_secret": config.SENTINEL_HUB_CLIENT_SECRET,
-        })
-        token_resp.raise_for_status()
-        access_token = token_resp.json()["access_token"]
+        # Step 1: Get OAuth2 token (reused until shortly before it expires)
+        session = _http_session()
+        access_token = _sentinel_token(session)
 
         # Step 2: Process API request for 4-band data
         evalscript = """
@@ -220,17 +286,18 @@ def fetch_sentinel_imagery(
             "evalscript": evalscript,
         }
 
-        resp = requests.post(
+        # Stream the GeoTIFF to disk in chunks instead of buffering the body
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with session.post(
             process_url,
             headers={"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"},
             json=request_body,
-        )
-        resp.raise_for_status()
-
-        # Save the response as GeoTIFF
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(str(output_path), "wb") as f:
-            f.write(resp.content)
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            with open(str(output_path), "wb") as f:
+                for chunk in resp.iter_content(chunk_size=_DOWNLOAD_CHUNK_BYTES):
+                    f.write(chunk)
 
         metadata = {
             "source": "sentinel-hub",
@@ -247,5 +314,6 @@ def fetch_sentinel_imagery(
         return metadata
 
     except Exception as e:
+        _token_cache["expires_at"] = 0.0  # Re-authenticate next time in case the token was rejected
         logger.warning(f"Sentinel Hub API failed ({e}), falling back to synthetic data")
         return _generate_synthetic_sentinel(output_path, seed=hash(timestamp) % 10000)
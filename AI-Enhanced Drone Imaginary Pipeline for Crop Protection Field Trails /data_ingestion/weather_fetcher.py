@@ -5,23 +5,39 @@ Fetches real-time weather and soil data for field coordinates.
 Falls back to synthetic weather generation when API key is unavailable.
 """
 
-import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 
+# Shared keep-alive HTTP session for the OpenWeatherMap calls (built lazily)
+_session = None
+
 
 def _generate_synthetic_weather(lat: float, lon: float) -> dict:
     """Generate realistic synthetic weather data for agricultural context."""
-    np.random.seed(int(datetime.utcnow().timestamp()) % 100000)
+    return _generate_synthetic_weather_batch([lat], [lon])[0]
+
+
+def _generate_synthetic_weather_batch(lats, lons) -> list:
+    """
+    Synthetic weather for several coordinates at once: each reading is drawn
+    for every location in one NumPy call, then split into one dict per
+    location, in the same shape as _generate_synthetic_weather.
+    """
+    # Own generator instead of reseeding the global one, so this can run
+    # alongside the synthetic imagery generator in another thread
+    rng = np.random.RandomState(int(datetime.utcnow().timestamp()) % 100000)
+    n = len(lats)
 
     # Seasonal base temperature (Northern Hemisphere agriculture)
     month = datetime.utcnow().month
@@ -29,51 +45,70 @@ def _generate_synthetic_weather(lat: float, lon: float) -> dict:
         1: -2, 2: 1, 3: 8, 4: 14, 5: 20, 6: 26,
         7: 30, 8: 28, 9: 22, 10: 14, 11: 6, 12: 0
     }
-    base_temp = seasonal_temp.get(month, 20) + np.random.normal(0, 3)
+    base_temp = seasonal_temp.get(month, 20) + rng.normal(0, 3, n)
 
     # Wind and humidity correlated with temperature
-    humidity = max(20, min(95, 70 - base_temp * 0.5 + np.random.normal(0, 10)))
-    wind_speed = max(0, 3 + np.random.exponential(2))
-    cloud_cover = max(0, min(100, np.random.beta(2, 3) * 100))
+    humidity = np.clip(70 - base_temp * 0.5 + rng.normal(0, 10, n), 20, 95)
+    wind_speed = np.maximum(0, 3 + rng.exponential(2, n))
+    cloud_cover = np.clip(rng.beta(2, 3, n) * 100, 0, 100)
 
     # Soil moisture depends on recent "rain" probability
-    rain_chance = 0.3 if humidity > 60 else 0.1
-    rain = np.random.exponential(5) if np.random.random() < rain_chance else 0
-    soil_moisture = max(0.05, min(0.95, 0.4 + rain * 0.02 + np.random.normal(0, 0.1)))
+    rain_chance = np.where(humidity > 60, 0.3, 0.1)
+    rain = np.where(rng.random(n) < rain_chance, rng.exponential(5, n), 0)
+    soil_moisture = np.clip(0.4 + rain * 0.02 + rng.normal(0, 0.1, n), 0.05, 0.95)
 
     # Calculate agricultural indices
     dew_point = base_temp - ((100 - humidity) / 5)
-    heat_index = base_temp + 0.5 * (humidity / 100) * base_temp if base_temp > 26 else base_temp
-
-    weather = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "source": "synthetic",
-        "coordinates": {"lat": lat, "lon": lon},
-        "current": {
-            "temperature_c": round(base_temp, 1),
-            "feels_like_c": round(heat_index, 1),
-            "humidity_pct": round(humidity, 1),
-            "pressure_hpa": round(1013 + np.random.normal(0, 5), 1),
-            "wind_speed_ms": round(wind_speed, 1),
-            "wind_direction_deg": int(np.random.uniform(0, 360)),
-            "cloud_cover_pct": round(cloud_cover, 1),
-            "visibility_m": int(min(10000, max(1000, 10000 - cloud_cover * 50))),
-            "uv_index": round(max(0, 8 - cloud_cover * 0.06 + np.random.normal(0, 0.5)), 1),
-            "description": _weather_description(base_temp, humidity, cloud_cover, rain),
-        },
-        "precipitation": {
-            "rain_mm": round(rain, 1),
-            "rain_probability_pct": round(rain_chance * 100, 0),
-        },
-        "soil": {
-            "moisture": round(soil_moisture, 3),
-            "temperature_c": round(base_temp - 3 + np.random.normal(0, 1), 1),
-        },
-        "agricultural_alerts": _generate_ag_alerts(base_temp, humidity, soil_moisture, wind_speed),
-        "dew_point_c": round(dew_point, 1),
-    }
+    heat_index = np.where(
+        base_temp > 26, base_temp + 0.5 * (humidity / 100) * base_temp, base_temp
+    )
+
+    pressure = 1013 + rng.normal(0, 5, n)
+    wind_direction = rng.uniform(0, 360, n)
+    visibility = np.clip(10000 - cloud_cover * 50, 1000, 10000)
+    uv_index = np.maximum(0, 8 - cloud_cover * 0.06 + rng.normal(0, 0.5, n))
+    soil_temp = base_temp - 3 + rng.normal(0, 1, n)
+
+    timestamp = datetime.utcnow().isoformat()
+    readings = zip(
+        lats, lons, base_temp.tolist(), heat_index.tolist(), humidity.tolist(),
+        pressure.tolist(), wind_speed.tolist(), wind_direction.tolist(),
+        cloud_cover.tolist(), visibility.tolist(), uv_index.tolist(),
+        rain.tolist(), rain_chance.tolist(), soil_moisture.tolist(),
+        soil_temp.tolist(), dew_point.tolist(),
+    )
+    batch = []
+    for (lat, lon, temp, feels_like, hum, pres, wind, wind_dir, clouds, vis,
+         uv, rain_mm, chance, moisture, soil_t, dew) in readings:
+        batch.append({
+            "timestamp": timestamp,
+            "source": "synthetic",
+            "coordinates": {"lat": lat, "lon": lon},
+            "current": {
+                "temperature_c": round(temp, 1),
+                "feels_like_c": round(feels_like, 1),
+                "humidity_pct": round(hum, 1),
+                "pressure_hpa": round(pres, 1),
+                "wind_speed_ms": round(wind, 1),
+                "wind_direction_deg": int(wind_dir),
+                "cloud_cover_pct": round(clouds, 1),
+                "visibility_m": int(vis),
+                "uv_index": round(uv, 1),
+                "description": _weather_description(temp, hum, clouds, rain_mm),
+            },
+            "precipitation": {
+                "rain_mm": round(rain_mm, 1),
+                "rain_probability_pct": round(chance * 100, 0),
+            },
+            "soil": {
+                "moisture": round(moisture, 3),
+                "temperature_c": round(soil_t, 1),
+            },
+            "agricultural_alerts": _generate_ag_alerts(temp, hum, moisture, wind),
+            "dew_point_c": round(dew, 1),
+        })
 
-    return weather
+    return batch
 
 
 def _weather_description(temp, humidity, clouds, rain) -> str:
@@ -174,10 +209,36 @@ def fetch_weather(
     return weather
 
 
+def _http_session():
+    """
+    One keep-alive HTTP session per process, with a connection pool large
+    enough for every location to be fetched at once without reconnecting.
+    Rate-limit and transient server errors are retried with a short backoff;
+    read timeouts are not, so a hung endpoint still costs one timeout. Once
+    retries run out the last response is returned for the caller to check.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        retry = Retry(
+            total=2,
+            read=False,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        _session = requests.Session()
+        _session.mount(
+            "https://",
+            HTTPAdapter(pool_maxsize=len(GLOBAL_LOCATIONS), max_retries=retry),
+        )
+    return _session
+
+
 def _fetch_live_weather(lat: float, lon: float) -> dict:
     """Fetch live weather from OpenWeatherMap API."""
-    import requests
-
     try:
         # Current weather
         url = "https://api.openweathermap.org/data/2.5/weather"
@@ -186,7 +247,7 @@ def _fetch_live_weather(lat: float, lon: float) -> dict:
             "appid": config.OPENWEATHERMAP_API_KEY,
             "units": "metric",
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _http_session().get(url, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
 
@@ -239,17 +300,21 @@ def _save_weather(weather: dict):
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     filepath = config.WEATHER_DIR / f"weather_{timestamp}.json"
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w") as f:
-        json.dump(weather, f, indent=2)
+    filepath.write_bytes(_dumps_weather(weather))
     logger.info(f"Saved weather data: {filepath}")
 
 
+def _dumps_weather(data: dict) -> bytes:
+    """Indented JSON bytes, accepting NumPy values as well as Python ones."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+
 def get_latest_weather() -> dict:
     """Load the most recent weather data from file."""
-    weather_files = sorted(config.WEATHER_DIR.glob("weather_*.json"), reverse=True)
-    if weather_files:
-        with open(weather_files[0]) as f:
-            return json.load(f)
+    # Names embed the fetch timestamp, so the greatest name is the newest
+    latest_file = max(config.WEATHER_DIR.glob("weather_*.json"), default=None)
+    if latest_file is not None:
+        return orjson.loads(latest_file.read_bytes())
     return fetch_weather()
 
 
@@ -286,51 +351,74 @@ def fetch_multi_location_weather() -> dict:
         dict keyed by location name, each value is the full weather dict
         with an extra 'location_name', 'crop', and 'region' field.
     """
+    # Try live API for all locations if key is available. The requests are
+    # independent and network-bound, so all of them are put in flight at
+    # once (one worker each, so the wait is bounded by the slowest single
+    # request) and the synthetic baseline is built while they are pending.
+    pool = live = None
+    if config.has_openweather_key():
+        session = _http_session()
+        pool = ThreadPoolExecutor(max_workers=len(GLOBAL_LOCATIONS))
+        live = [
+            pool.submit(_fetch_live_current, session, info)
+            for info in GLOBAL_LOCATIONS.values()
+        ]
+
     results = {}
-    for name, info in GLOBAL_LOCATIONS.items():
-        weather = _generate_synthetic_weather(info["lat"], info["lon"])
+    synthetic = _generate_synthetic_weather_batch(
+        [info["lat"] for info in GLOBAL_LOCATIONS.values()],
+        [info["lon"] for info in GLOBAL_LOCATIONS.values()],
+    )
+    for (name, info), weather in zip(GLOBAL_LOCATIONS.items(), synthetic):
         weather["location_name"] = name
         weather["crop"] = info["crop"]
         weather["region"] = info["region"]
         results[name] = weather
 
-    # Try live API for all locations if key is available
-    if config.has_openweather_key():
-        import requests
-        for name, info in GLOBAL_LOCATIONS.items():
-            try:
-                url = "https://api.openweathermap.org/data/2.5/weather"
-                params = {
-                    "lat": info["lat"], "lon": info["lon"],
-                    "appid": config.OPENWEATHERMAP_API_KEY,
-                    "units": "metric",
-                }
-                resp = requests.get(url, params=params, timeout=5)
-                if resp.ok:
-                    data = resp.json()
-                    results[name]["current"]["temperature_c"] = data["main"]["temp"]
-                    results[name]["current"]["humidity_pct"] = data["main"]["humidity"]
-                    results[name]["current"]["wind_speed_ms"] = data["wind"]["speed"]
-                    results[name]["current"]["description"] = data["weather"][0]["description"]
-                    results[name]["current"]["cloud_cover_pct"] = data["clouds"]["all"]
+    if pool is not None:
+        with pool:
+            for name, future in zip(GLOBAL_LOCATIONS, live):
+                current = future.result()
+                if current is not None:
+                    results[name]["current"].update(current)
                     results[name]["source"] = "openweathermap"
-            except Exception:
-                pass  # Keep synthetic for this location
 
     # Save the combined file
     filepath = config.WEATHER_DIR / "multi_state_weather.json"
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w") as f:
-        json.dump(results, f, indent=2)
+    filepath.write_bytes(_dumps_weather(results))
     logger.info(f"Generated weather for {len(results)} locations")
 
     return results
 
 
+def _fetch_live_current(session, info: dict) -> dict:
+    """Fetch current conditions for one location, or None on failure."""
+    try:
+        url = "https://api.openweathermap.org/data/2.5/weather"
+        params = {
+            "lat": info["lat"], "lon": info["lon"],
+            "appid": config.OPENWEATHERMAP_API_KEY,
+            "units": "metric",
+        }
+        resp = session.get(url, params=params, timeout=5)
+        if resp.ok:
+            data = resp.json()
+            return {
+                "temperature_c": data["main"]["temp"],
+                "humidity_pct": data["main"]["humidity"],
+                "wind_speed_ms": data["wind"]["speed"],
+                "description": data["weather"][0]["description"],
+                "cloud_cover_pct": data["clouds"]["all"],
+            }
+    except Exception:
+        pass  # Keep synthetic for this location
+    return None
+
+
 def get_multi_location_weather() -> dict:
     """Load or generate multi-location weather."""
     filepath = config.WEATHER_DIR / "multi_state_weather.json"
     if filepath.exists():
-        with open(filepath) as f:
-            return json.load(f)
+        return orjson.loads(filepath.read_bytes())
     return fetch_multi_location_weather()
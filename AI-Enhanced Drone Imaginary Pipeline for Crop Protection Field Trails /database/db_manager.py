@@ -5,13 +5,16 @@ Stores pipeline metadata, NDVI results, health assessments, and weather data.
 Schema mirrors PostGIS for easy migration.
 """
 
-import json
 import logging
 import sqlite3
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,14 +27,53 @@ class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = str(db_path or config.DB_PATH)
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the manager's lifetime, so SQLite's page cache
+        # and parsed schema survive between queries. The dashboard shares a
+        # manager across sessions, hence the lock around each use.
+        self._connection = None
+        self._lock = threading.Lock()
         self._init_db()
 
+    @contextmanager
     def _conn(self):
-        return sqlite3.connect(self.db_path)
+        """The shared connection, held for one transaction (committed on exit)."""
+        with self._lock:
+            if self._connection is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                # With WAL, NORMAL syncs at checkpoints rather than on every
+                # commit and is still safe against corruption on a crash
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._connection = conn
+            with self._connection:
+                yield self._connection
+
+    # Newest row of each timestamped table, as fixed strings so every call
+    # hits the connection's prepared-statement cache (and idx_*_ts)
+    _LATEST_SQL = {
+        table: f"SELECT * FROM {table} ORDER BY timestamp DESC LIMIT 1"
+        for table in ("imagery", "ndvi_results", "health_assessments", "weather_data")
+    }
+
+    @classmethod
+    def _latest(cls, conn, table: str) -> dict:
+        row = conn.execute(cls._LATEST_SQL[table]).fetchone()
+        return dict(row) if row else {}
+
+    def close(self):
+        """Close the connection; the next query reopens it."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
 
     def _init_db(self):
         """Create tables if they don't exist."""
         with self._conn() as conn:
+            # Persistent in the database file: readers no longer block the
+            # pipeline's writes, and commits append to the log instead of
+            # rewriting pages
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS imagery (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -93,43 +135,68 @@ class DatabaseManager:
                     steps_completed TEXT,
                     error_message TEXT
                 );
+
+                -- The "latest" and history queries order by time and take
+                -- the first rows, which these turn into an index walk
+                CREATE INDEX IF NOT EXISTS idx_imagery_ts ON imagery(timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_ndvi_ts ON ndvi_results(timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_health_ts ON health_assessments(timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_weather_ts ON weather_data(timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_runs_start ON pipeline_runs(start_time DESC);
             """)
         logger.info("Database initialized")
 
     # ── Imagery ──────────────────────────────────────────────
 
-    def insert_imagery(self, metadata: dict) -> int:
+    _IMAGERY_INSERT = """
+        INSERT INTO imagery (file_path, source, timestamp,
+            bbox_west, bbox_south, bbox_east, bbox_north,
+            crs, width, height, bands, metadata_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _imagery_row(metadata: dict, metadata_json: bytes = None) -> tuple:
+        if metadata_json is None:
+            metadata_json = orjson.dumps(metadata, option=orjson.OPT_SERIALIZE_NUMPY)
         bbox = metadata.get("bbox", {})
+        return (
+            metadata.get("file_path", ""),
+            metadata.get("source", "synthetic"),
+            metadata.get("timestamp", datetime.utcnow().isoformat()),
+            bbox.get("west"), bbox.get("south"),
+            bbox.get("east"), bbox.get("north"),
+            metadata.get("crs", "EPSG:4326"),
+            metadata.get("size_px", 512), metadata.get("size_px", 512),
+            len(metadata.get("bands", [])),
+            metadata_json.decode(),
+        )
+
+    def insert_imagery(self, metadata: dict, metadata_json: bytes = None) -> int:
+        """
+        Record an imagery file. A caller already holding ``metadata`` as
+        encoded JSON can pass it as ``metadata_json`` to skip re-encoding.
+        """
         with self._conn() as conn:
-            cursor = conn.execute("""
-                INSERT INTO imagery (file_path, source, timestamp,
-                    bbox_west, bbox_south, bbox_east, bbox_north,
-                    crs, width, height, bands, metadata_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metadata.get("file_path", ""),
-                metadata.get("source", "synthetic"),
-                metadata.get("timestamp", datetime.utcnow().isoformat()),
-                bbox.get("west"), bbox.get("south"),
-                bbox.get("east"), bbox.get("north"),
-                metadata.get("crs", "EPSG:4326"),
-                metadata.get("size_px", 512), metadata.get("size_px", 512),
-                len(metadata.get("bands", [])),
-                json.dumps(metadata),
-            ))
+            cursor = conn.execute(
+                self._IMAGERY_INSERT, self._imagery_row(metadata, metadata_json)
+            )
             return cursor.lastrowid
 
+    def insert_many_imagery(self, metadata_list: list) -> list:
+        """Record several imagery files in one transaction; returns their ids."""
+        with self._conn() as conn:
+            return [
+                conn.execute(self._IMAGERY_INSERT, self._imagery_row(m)).lastrowid
+                for m in metadata_list
+            ]
+
     def get_latest_imagery(self) -> dict:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                "SELECT * FROM imagery ORDER BY timestamp DESC LIMIT 1"
-            ).fetchone()
-            return dict(row) if row else {}
+            return self._latest(conn, "imagery")
 
     def get_all_imagery(self, limit: int = 50) -> list:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM imagery ORDER BY timestamp DESC LIMIT ?", (limit,)
             ).fetchall()
@@ -137,29 +204,45 @@ class DatabaseManager:
 
     # ── NDVI Results ─────────────────────────────────────────
 
-    def insert_ndvi_result(self, imagery_id: int, result: dict) -> int:
+    _NDVI_INSERT = """
+        INSERT INTO ndvi_results (imagery_id, file_path, timestamp,
+            ndvi_mean, ndvi_std, ndvi_min, ndvi_max,
+            healthy_pct, moderate_pct, severe_pct, critical_pct, stats_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _ndvi_row(imagery_id: int, result: dict) -> tuple:
         stats = result.get("statistics", {})
+        return (
+            imagery_id,
+            result.get("output_file", ""),
+            result.get("timestamp", datetime.utcnow().isoformat()),
+            stats.get("mean"), stats.get("std"),
+            stats.get("min"), stats.get("max"),
+            stats.get("healthy_pct"), stats.get("moderate_stress_pct"),
+            stats.get("severe_stress_pct"), stats.get("critical_pct"),
+            orjson.dumps(stats, option=orjson.OPT_SERIALIZE_NUMPY).decode(),
+        )
+
+    def insert_ndvi_result(self, imagery_id: int, result: dict) -> int:
         with self._conn() as conn:
-            cursor = conn.execute("""
-                INSERT INTO ndvi_results (imagery_id, file_path, timestamp,
-                    ndvi_mean, ndvi_std, ndvi_min, ndvi_max,
-                    healthy_pct, moderate_pct, severe_pct, critical_pct, stats_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                imagery_id,
-                result.get("output_file", ""),
-                result.get("timestamp", datetime.utcnow().isoformat()),
-                stats.get("mean"), stats.get("std"),
-                stats.get("min"), stats.get("max"),
-                stats.get("healthy_pct"), stats.get("moderate_stress_pct"),
-                stats.get("severe_stress_pct"), stats.get("critical_pct"),
-                json.dumps(stats),
-            ))
+            cursor = conn.execute(self._NDVI_INSERT, self._ndvi_row(imagery_id, result))
             return cursor.lastrowid
 
+    def insert_many_ndvi_results(self, results: list) -> list:
+        """
+        Insert ``(imagery_id, result)`` pairs in one transaction; returns the
+        new row ids, in order, for the health assessments to reference.
+        """
+        with self._conn() as conn:
+            return [
+                conn.execute(self._NDVI_INSERT, self._ndvi_row(img_id, r)).lastrowid
+                for img_id, r in results
+            ]
+
     def get_ndvi_history(self, limit: int = 30) -> list:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM ndvi_results ORDER BY timestamp DESC LIMIT ?",
                 (limit,)
@@ -168,89 +251,137 @@ class DatabaseManager:
 
     def get_latest_ndvi(self) -> dict:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                "SELECT * FROM ndvi_results ORDER BY timestamp DESC LIMIT 1"
-            ).fetchone()
-            return dict(row) if row else {}
+            return self._latest(conn, "ndvi_results")
 
     # ── Health Assessments ───────────────────────────────────
 
+    _HEALTH_INSERT = """
+        INSERT INTO health_assessments (ndvi_result_id, timestamp,
+            overall_health, plot_count, healthy_count,
+            stressed_count, critical_count,
+            alerts_json, recommendations_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _health_row(ndvi_result_id: int, assessment: dict) -> tuple:
+        return (
+            ndvi_result_id,
+            assessment.get("timestamp", datetime.utcnow().isoformat()),
+            assessment.get("overall_health", "Unknown"),
+            0,  # plot_count from segmentation
+            int(assessment.get("pixel_counts", {}).get("healthy", 0)),
+            int(assessment.get("pixel_counts", {}).get("moderate_stress", 0) +
+                assessment.get("pixel_counts", {}).get("severe_stress", 0)),
+            int(assessment.get("pixel_counts", {}).get("critical", 0)),
+            orjson.dumps(
+                assessment.get("alerts", []), option=orjson.OPT_SERIALIZE_NUMPY
+            ).decode(),
+            orjson.dumps(
+                assessment.get("recommendations", []), option=orjson.OPT_SERIALIZE_NUMPY
+            ).decode(),
+        )
+
     def insert_health_assessment(self, ndvi_result_id: int, assessment: dict) -> int:
-        summary = assessment.get("percentages", {})
-        seg_summary = {}
         with self._conn() as conn:
-            cursor = conn.execute("""
-                INSERT INTO health_assessments (ndvi_result_id, timestamp,
-                    overall_health, plot_count, healthy_count,
-                    stressed_count, critical_count,
-                    alerts_json, recommendations_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                ndvi_result_id,
-                assessment.get("timestamp", datetime.utcnow().isoformat()),
-                assessment.get("overall_health", "Unknown"),
-                0,  # plot_count from segmentation
-                int(assessment.get("pixel_counts", {}).get("healthy", 0)),
-                int(assessment.get("pixel_counts", {}).get("moderate_stress", 0) +
-                    assessment.get("pixel_counts", {}).get("severe_stress", 0)),
-                int(assessment.get("pixel_counts", {}).get("critical", 0)),
-                json.dumps(assessment.get("alerts", [])),
-                json.dumps(assessment.get("recommendations", [])),
-            ))
+            cursor = conn.execute(
+                self._HEALTH_INSERT, self._health_row(ndvi_result_id, assessment)
+            )
             return cursor.lastrowid
 
+    def insert_many_health_assessments(self, assessments: list) -> None:
+        """Insert ``(ndvi_result_id, assessment)`` pairs in one transaction."""
+        with self._conn() as conn:
+            conn.executemany(
+                self._HEALTH_INSERT,
+                [self._health_row(ndvi_id, a) for ndvi_id, a in assessments],
+            )
+
     def get_latest_health(self) -> dict:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                "SELECT * FROM health_assessments ORDER BY timestamp DESC LIMIT 1"
-            ).fetchone()
-            return dict(row) if row else {}
+            return self._latest(conn, "health_assessments")
 
     # ── Weather ──────────────────────────────────────────────
 
-    def insert_weather(self, weather: dict) -> int:
+    _WEATHER_INSERT = """
+        INSERT INTO weather_data (timestamp, source,
+            temperature_c, humidity_pct, wind_speed_ms, pressure_hpa,
+            cloud_cover_pct, soil_moisture, soil_temp_c, rain_mm,
+            description, alerts_json, full_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _weather_row(weather: dict) -> tuple:
         current = weather.get("current", {})
         soil = weather.get("soil", {})
         precip = weather.get("precipitation", {})
+        # The alerts are encoded once, for their own column, and spliced into
+        # the full document as an already-encoded fragment. Same encoder as
+        # the weather JSON files written by the fetcher.
+        alerts_json = orjson.dumps(
+            weather.get("agricultural_alerts", []), option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        if "agricultural_alerts" in weather:
+            weather = {**weather, "agricultural_alerts": orjson.Fragment(alerts_json)}
+        return (
+            weather.get("timestamp", datetime.utcnow().isoformat()),
+            weather.get("source", "synthetic"),
+            current.get("temperature_c"), current.get("humidity_pct"),
+            current.get("wind_speed_ms"), current.get("pressure_hpa"),
+            current.get("cloud_cover_pct"),
+            soil.get("moisture"), soil.get("temperature_c"),
+            precip.get("rain_mm"),
+            current.get("description", ""),
+            alerts_json.decode(),
+            orjson.dumps(weather, option=orjson.OPT_SERIALIZE_NUMPY).decode(),
+        )
+
+    def insert_weather(self, weather: dict) -> int:
         with self._conn() as conn:
-            cursor = conn.execute("""
-                INSERT INTO weather_data (timestamp, source,
-                    temperature_c, humidity_pct, wind_speed_ms, pressure_hpa,
-                    cloud_cover_pct, soil_moisture, soil_temp_c, rain_mm,
-                    description, alerts_json, full_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                weather.get("timestamp", datetime.utcnow().isoformat()),
-                weather.get("source", "synthetic"),
-                current.get("temperature_c"), current.get("humidity_pct"),
-                current.get("wind_speed_ms"), current.get("pressure_hpa"),
-                current.get("cloud_cover_pct"),
-                soil.get("moisture"), soil.get("temperature_c"),
-                precip.get("rain_mm"),
-                current.get("description", ""),
-                json.dumps(weather.get("agricultural_alerts", [])),
-                json.dumps(weather),
-            ))
+            cursor = conn.execute(self._WEATHER_INSERT, self._weather_row(weather))
             return cursor.lastrowid
 
+    def insert_many_weather(self, readings: list) -> None:
+        """Insert several weather readings in one transaction."""
+        with self._conn() as conn:
+            conn.executemany(
+                self._WEATHER_INSERT, [self._weather_row(w) for w in readings]
+            )
+
     def get_weather_history(self, limit: int = 48) -> list:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM weather_data ORDER BY timestamp DESC LIMIT ?",
                 (limit,)
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def get_weather_trend(self, limit: int = 24) -> dict:
+        """
+        Minute timestamps and the temperature, humidity and soil readings of
+        the last ``limit`` weather records (all of them if ``limit`` is
+        None), oldest first, as one list per column with missing readings
+        as 0.
+        """
+        with self._conn() as conn:
+            rows = conn.execute("""
+                SELECT substr(timestamp, 1, 16),
+                       COALESCE(temperature_c, 0), COALESCE(humidity_pct, 0),
+                       COALESCE(soil_moisture, 0), COALESCE(soil_temp_c, 0)
+                FROM (
+                    SELECT timestamp, temperature_c, humidity_pct,
+                           soil_moisture, soil_temp_c
+                    FROM weather_data ORDER BY timestamp DESC LIMIT ?
+                ) ORDER BY timestamp
+            """, (-1 if limit is None else limit,)).fetchall()
+        keys = ("timestamp", "temperature_c", "humidity_pct", "soil_moisture", "soil_temp_c")
+        columns = zip(*rows) if rows else ((),) * len(keys)
+        return {key: list(col) for key, col in zip(keys, columns)}
+
     def get_latest_weather(self) -> dict:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                "SELECT * FROM weather_data ORDER BY timestamp DESC LIMIT 1"
-            ).fetchone()
-            return dict(row) if row else {}
+            return self._latest(conn, "weather_data")
 
     # ── Pipeline Runs ────────────────────────────────────────
 
@@ -279,26 +410,62 @@ class DatabaseManager:
 
     def get_pipeline_history(self, limit: int = 20) -> list:
         with self._conn() as conn:
-            conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM pipeline_runs ORDER BY start_time DESC LIMIT ?",
                 (limit,)
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def get_pipeline_latencies(self, limit: int = 20) -> dict:
+        """
+        Start times and processing times of the last ``limit`` completed
+        runs with a recorded time (all of them if ``limit`` is None), oldest
+        first, as one list per column.
+        """
+        with self._conn() as conn:
+            rows = conn.execute("""
+                SELECT start_time, processing_time_s FROM (
+                    SELECT start_time, processing_time_s FROM pipeline_runs
+                    WHERE status='completed' AND processing_time_s != 0
+                    ORDER BY start_time DESC LIMIT ?
+                ) ORDER BY start_time
+            """, (-1 if limit is None else limit,)).fetchall()
+        start_times, times = zip(*rows) if rows else ((), ())
+        return {"start_time": list(start_times), "processing_time_s": list(times)}
+
     def get_pipeline_stats(self) -> dict:
         with self._conn() as conn:
-            total = conn.execute("SELECT COUNT(*) FROM pipeline_runs").fetchone()[0]
-            completed = conn.execute(
-                "SELECT COUNT(*) FROM pipeline_runs WHERE status='completed'"
-            ).fetchone()[0]
-            avg_time = conn.execute(
-                "SELECT AVG(processing_time_s) FROM pipeline_runs WHERE status='completed'"
-            ).fetchone()[0]
-            return {
-                "total_runs": total,
-                "completed": completed,
-                "failed": total - completed,
-                "avg_processing_time_s": round(avg_time, 2) if avg_time else 0,
-                "success_rate": round(completed / total * 100, 1) if total > 0 else 0,
-            }
+            return self._pipeline_stats(conn)
+
+    @staticmethod
+    def _pipeline_stats(conn) -> dict:
+        # Counts and average latency in a single scan of pipeline_runs
+        total, completed, avg_time = conn.execute("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(status='completed'), 0),
+                   AVG(CASE WHEN status='completed' THEN processing_time_s END)
+            FROM pipeline_runs
+        """).fetchone()
+        return {
+            "total_runs": total,
+            "completed": completed,
+            "failed": total - completed,
+            "avg_processing_time_s": round(avg_time, 2) if avg_time else 0,
+            "success_rate": round(completed / total * 100, 1) if total > 0 else 0,
+        }
+
+    # ── Dashboard ────────────────────────────────────────────
+
+    def get_overview_bundle(self) -> dict:
+        """
+        Latest NDVI result, health assessment and weather reading plus the
+        pipeline stats, read over one connection for the overview KPIs.
+        """
+        with self._conn() as conn:
+            latest = {}
+            for key, table in [("ndvi", "ndvi_results"),
+                               ("health", "health_assessments"),
+                               ("weather", "weather_data")]:
+                latest[key] = self._latest(conn, table)
+            latest["stats"] = self._pipeline_stats(conn)
+            return latest
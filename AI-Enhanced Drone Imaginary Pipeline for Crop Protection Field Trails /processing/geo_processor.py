@@ -19,7 +19,7 @@ import config
 def get_bounds(tiff_path: str) -> dict:
     """Extract geographic bounds from a GeoTIFF."""
     import rasterio
-    with rasterio.open(str(tiff_path)) as src:
+    with rasterio.open(tiff_path) as src:
         bounds = src.bounds
         return {
             "west": bounds.left,
@@ -32,6 +32,38 @@ def get_bounds(tiff_path: str) -> dict:
         }
 
 
+def _stretch_limits(band: np.ndarray) -> np.ndarray:
+    """
+    2nd and 98th percentiles of the band's non-zero pixels. For 8/16-bit
+    imagery they are read off a histogram of the raw values (the same
+    linearly interpolated order statistics np.percentile returns) rather
+    than partitioning a float copy of the masked band.
+    """
+    if band.dtype.kind == "u" and band.dtype.itemsize <= 2:
+        counts = np.bincount(band.ravel())
+        counts[0] = 0
+        cumulative = np.cumsum(counts)
+        pos = np.array([2, 98]) / 100 * (cumulative[-1] - 1)
+        below = np.floor(pos)
+        lower = np.searchsorted(cumulative, below, side="right")
+        upper = np.searchsorted(cumulative, below + 1, side="right")
+        return (lower + (pos - below) * (upper - lower)).astype(np.float32)
+    band = band.astype(np.float32)
+    return np.percentile(band[band > 0], [2, 98])
+
+
+def _normalize(band: np.ndarray) -> np.ndarray:
+    """Normalize to 0-255 with contrast stretch (2-98 percentile)."""
+    p2, p98 = _stretch_limits(band)
+    # One float32 working copy, updated in place, instead of a new
+    # full-size temporary for every arithmetic step
+    stretched = np.subtract(band, p2, dtype=np.float32)
+    stretched /= p98 - p2 + 1e-8
+    np.clip(stretched, 0, 1, out=stretched)
+    stretched *= 255
+    return stretched.astype(np.uint8)
+
+
 def create_rgb_composite(tiff_path: str, output_path: str = None) -> str:
     """
     Create a true-color RGB composite from a 4-band GeoTIFF.
@@ -46,24 +78,12 @@ def create_rgb_composite(tiff_path: str, output_path: str = None) -> str:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with rasterio.open(str(tiff_path)) as src:
-        red = src.read(3).astype(np.float32)
-        green = src.read(2).astype(np.float32)
-        blue = src.read(1).astype(np.float32)
+    with rasterio.open(tiff_path) as src:
+        red, green, blue = src.read((3, 2, 1))
 
-    # Normalize to 0-255 with contrast stretch (2-98 percentile)
-    def _normalize(band):
-        p2, p98 = np.percentile(band[band > 0], [2, 98])
-        clipped = np.clip((band - p2) / (p98 - p2 + 1e-8), 0, 1)
-        return (clipped * 255).astype(np.uint8)
-
-    r = _normalize(red)
-    g = _normalize(green)
-    b = _normalize(blue)
-
-    rgb = np.stack([r, g, b], axis=-1)
+    rgb = np.stack([_normalize(red), _normalize(green), _normalize(blue)], axis=-1)
     img = Image.fromarray(rgb)
-    img.save(str(output_path))
+    img.save(output_path, compress_level=config.PNG_COMPRESS_LEVEL)
     logger.info(f"RGB composite saved: {output_path}")
     return str(output_path)
 
@@ -81,28 +101,60 @@ def create_false_color_composite(tiff_path: str, output_path: str = None) -> str
         output_path = config.PROCESSED_DIR / f"false_color_{tiff_path.stem}.png"
     output_path = Path(output_path)
 
-    with rasterio.open(str(tiff_path)) as src:
-        nir = src.read(4).astype(np.float32)
-        red = src.read(3).astype(np.float32)
-        green = src.read(2).astype(np.float32)
-
-    def _normalize(band):
-        p2, p98 = np.percentile(band[band > 0], [2, 98])
-        clipped = np.clip((band - p2) / (p98 - p2 + 1e-8), 0, 1)
-        return (clipped * 255).astype(np.uint8)
+    with rasterio.open(tiff_path) as src:
+        nir, red, green = src.read((4, 3, 2))
 
     rgb = np.stack([_normalize(nir), _normalize(red), _normalize(green)], axis=-1)
     img = Image.fromarray(rgb)
-    img.save(str(output_path))
+    img.save(output_path, compress_level=config.PNG_COMPRESS_LEVEL)
     logger.info(f"False-color composite saved: {output_path}")
     return str(output_path)
 
 
+def create_composites(tiff_path: str, rgb_path: str = None,
+                      false_color_path: str = None) -> tuple:
+    """
+    Create both the true-color and false-color composites of a GeoTIFF.
+    Same images as create_rgb_composite and create_false_color_composite,
+    but the bands are read once and red and green, which appear in both,
+    are stretched once.
+
+    Returns:
+        (rgb_path, false_color_path)
+    """
+    import rasterio
+    from PIL import Image
+
+    tiff_path = Path(tiff_path)
+    if rgb_path is None:
+        rgb_path = config.PROCESSED_DIR / f"rgb_{tiff_path.stem}.png"
+    if false_color_path is None:
+        false_color_path = config.PROCESSED_DIR / f"false_color_{tiff_path.stem}.png"
+    rgb_path, false_color_path = Path(rgb_path), Path(false_color_path)
+    rgb_path.parent.mkdir(parents=True, exist_ok=True)
+    false_color_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with rasterio.open(tiff_path) as src:
+        blue, green, red, nir = (_normalize(band) for band in src.read((1, 2, 3, 4)))
+
+    Image.fromarray(np.stack([red, green, blue], axis=-1)).save(
+        rgb_path, compress_level=config.PNG_COMPRESS_LEVEL
+    )
+    logger.info(f"RGB composite saved: {rgb_path}")
+    Image.fromarray(np.stack([nir, red, green], axis=-1)).save(
+        false_color_path, compress_level=config.PNG_COMPRESS_LEVEL
+    )
+    logger.info(f"False-color composite saved: {false_color_path}")
+    return str(rgb_path), str(false_color_path)
+
+
 def extract_metadata(tiff_path: str) -> dict:
     """Extract comprehensive metadata from a GeoTIFF."""
     import rasterio
 
-    with rasterio.open(str(tiff_path)) as src:
+    with rasterio.open(tiff_path) as src:
+        # Each access to these properties builds a new object from GDAL
+        bounds, transform = src.bounds, src.transform
         return {
             "file_path": str(tiff_path),
             "width": src.width,
@@ -111,15 +163,17 @@ def extract_metadata(tiff_path: str) -> dict:
             "dtype": str(src.dtypes[0]),
             "crs": str(src.crs),
             "bounds": {
-                "west": src.bounds.left,
-                "south": src.bounds.bottom,
-                "east": src.bounds.right,
-                "north": src.bounds.top,
+                "west": bounds.left,
+                "south": bounds.bottom,
+                "east": bounds.right,
+                "north": bounds.top,
             },
-            "transform": list(src.transform)[:6],
+            # The six affine coefficients a-f, sliced from the Affine itself
+            # rather than from a list of all nine
+            "transform": list(transform[:6]),
             "resolution": {
-                "x": abs(src.transform[0]),
-                "y": abs(src.transform[4]),
+                "x": abs(transform.a),
+                "y": abs(transform.e),
             },
             "tags": dict(src.tags()),
             "band_descriptions": [src.descriptions[i] for i in range(src.count)],
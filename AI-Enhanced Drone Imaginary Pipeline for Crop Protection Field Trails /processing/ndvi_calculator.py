@@ -17,19 +17,51 @@ logger = logging.getLogger(__name__)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 
+# Input rows processed per window in calculate_ndvi; bounds the band buffers
+# on full-size Sentinel-2 tiles while a 512 px scene is still a single read
+_WINDOW_ROWS = 512
 
-def calculate_ndvi(input_path: str, output_path: str = None) -> dict:
+# ndvi_to_rgb colours: Critical (purple), Severe (red-orange), Moderate
+# (yellow-orange, shaded per pixel) and Healthy (green)
+_CLASS_PALETTE = np.array(
+    [[142, 68, 173], [231, 76, 60], [243, 156, 18], [46, 204, 113]], dtype=np.uint8
+)
+# Moderate-stress shade endpoints per channel (R, G, B): yellow-orange at
+# the moderate threshold towards green at the healthy one
+_MODERATE_GRADIENT = ((243, 46), (156, 204), (18, 113))
+
+
+def _ndvi_into(red: np.ndarray, nir: np.ndarray, out: np.ndarray) -> None:
+    """
+    NDVI of float32 ``red`` and ``nir`` into ``out``, clipped to [-1, 1] and
+    0 where the bands sum to 0. ``nir`` is overwritten.
+    """
+    # The quotient overwrites the denominator and the numerator reuses the
+    # NIR buffer. Clamping the denominator to 0 first (fmax also maps NaN
+    # to 0) means every pixel the division skips already holds its 0.
+    denominator = np.add(nir, red, out=out)
+    numerator = np.subtract(nir, red, out=nir)
+    np.fmax(denominator, 0, out=denominator)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    np.clip(out, -1.0, 1.0, out=out)
+
+
+def calculate_ndvi(input_path: str, output_path: str = None,
+                   return_array: bool = False) -> dict:
     """
     Calculate NDVI from a 4-band GeoTIFF (B02, B03, B04, B08).
 
     Args:
         input_path: Path to input multi-band GeoTIFF.
         output_path: Path for output NDVI GeoTIFF. Auto-generated if None.
+        return_array: Also return the NDVI band under ``"array"``, so
+            callers colouring or classifying it need not read it back.
 
     Returns:
         dict with NDVI statistics and file paths.
     """
     import rasterio
+    from rasterio.windows import Window
 
     input_path = Path(input_path)
     if output_path is None:
@@ -37,58 +69,70 @@ def calculate_ndvi(input_path: str, output_path: str = None) -> dict:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with rasterio.open(str(input_path)) as src:
-        # Band order: 1=Blue, 2=Green, 3=Red, 4=NIR
-        red = src.read(3).astype(np.float32)
-        nir = src.read(4).astype(np.float32)
+    with rasterio.open(input_path) as src:
         profile = src.profile.copy()
-        transform = src.transform
         crs = src.crs
-
-    # Calculate NDVI
-    denominator = nir + red
-    ndvi = np.where(
-        denominator > 0,
-        (nir - red) / denominator,
-        0.0  # No-data where both bands are 0
-    )
-    ndvi = ndvi.clip(-1.0, 1.0).astype(np.float32)
-
-    # Write NDVI GeoTIFF
-    profile.update(
-        dtype="float32",
-        count=1,
-        compress="deflate",
-        nodata=-9999,
-    )
-
-    with rasterio.open(str(output_path), "w", **profile) as dst:
-        dst.write(ndvi, 1)
-        dst.set_band_description(1, "NDVI")
-        dst.update_tags(
-            ndvi_formula="(NIR - Red) / (NIR + Red)",
-            source_file=str(input_path),
-            processed=datetime.utcnow().isoformat(),
+        profile.update(
+            dtype="float32",
+            count=1,
+            compress="deflate",
+            predictor=3,  # Floating-point predictor, not the input's integer one
+            nodata=-9999,
         )
 
+        # Read, compute and write NDVI a band of rows at a time, so only the
+        # NDVI itself is ever held for the whole scene (for the statistics)
+        ndvi = np.empty((src.height, src.width), dtype=np.float32)
+        with rasterio.open(output_path, "w", **profile) as dst:
+            for row in range(0, src.height, _WINDOW_ROWS):
+                window = Window(0, row, src.width, min(_WINDOW_ROWS, src.height - row))
+                # Band order: 1=Blue, 2=Green, 3=Red, 4=NIR; both read in one
+                # call, converted to float32 by rasterio
+                red, nir = src.read((3, 4), window=window, out_dtype="float32")
+                tile = ndvi[row:row + window.height]
+                _ndvi_into(red, nir, out=tile)
+                dst.write(tile, 1, window=window)
+            dst.set_band_description(1, "NDVI")
+            dst.update_tags(
+                ndvi_formula="(NIR - Red) / (NIR + Red)",
+                source_file=str(input_path),
+                processed=datetime.utcnow().isoformat(),
+            )
+
     # Compute statistics
-    valid = ndvi[ndvi > -9999]
+    # Drop nodata, skipping the compacting copy when there is none (the
+    # clip above keeps computed NDVI in [-1, 1], so that is the usual case).
+    # A min() reduction checks that without a full-size mask; it is NaN,
+    # and fails the test, if any pixel is.
+    valid = ndvi.ravel() if ndvi.min() > -9999 else ndvi[ndvi > -9999]
+    # Moments first: the percentiles below reorder ``valid`` in place
+    mean, std = float(np.mean(valid)), float(np.std(valid))
+    # Class percentages from cumulative threshold counts; a value equal to a
+    # threshold falls in the lower class. Edges share the data dtype so
+    # float32 values compare exactly as the per-class masks did.
+    edges = np.array(
+        [config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY], dtype=valid.dtype
+    )
+    at_or_below = [np.count_nonzero(valid <= edge) for edge in edges]
+    class_pct = np.diff(at_or_below, prepend=0, append=valid.size) / valid.size * 100
+    # Min, max and quartiles from a single partition of the data. The NDVI
+    # is already on disk, so unless it is returned it is partitioned in place
+    # rather than copied.
+    lo, p25, median, p75, hi = np.percentile(
+        valid, [0, 25, 50, 75, 100], overwrite_input=not return_array
+    )
     stats = {
-        "min": float(np.min(valid)),
-        "max": float(np.max(valid)),
-        "mean": float(np.mean(valid)),
-        "std": float(np.std(valid)),
-        "median": float(np.median(valid)),
-        "p25": float(np.percentile(valid, 25)),
-        "p75": float(np.percentile(valid, 75)),
-        "healthy_pct": float((valid > config.NDVI_HEALTHY).mean() * 100),
-        "moderate_stress_pct": float(
-            ((valid > config.NDVI_MODERATE) & (valid <= config.NDVI_HEALTHY)).mean() * 100
-        ),
-        "severe_stress_pct": float(
-            ((valid > config.NDVI_SEVERE) & (valid <= config.NDVI_MODERATE)).mean() * 100
-        ),
-        "critical_pct": float((valid <= config.NDVI_SEVERE).mean() * 100),
+        "min": float(lo),
+        "max": float(hi),
+        "mean": mean,
+        "std": std,
+        "median": float(median),
+        "p25": float(p25),
+        "p75": float(p75),
+        "healthy_pct": float(class_pct[3]),
+        "moderate_stress_pct": float(class_pct[2]),
+        "severe_stress_pct": float(class_pct[1]),
+        "critical_pct": float(class_pct[0]),
         "total_pixels": int(valid.size),
     }
 
@@ -99,6 +143,8 @@ def calculate_ndvi(input_path: str, output_path: str = None) -> dict:
         "statistics": stats,
         "crs": str(crs),
     }
+    if return_array:
+        result["array"] = ndvi
 
     logger.info(
         f"NDVI calculated: mean={stats['mean']:.3f}, "
@@ -108,53 +154,82 @@ def calculate_ndvi(input_path: str, output_path: str = None) -> dict:
     return result
 
 
-def ndvi_to_rgb(ndvi_path: str, output_path: str = None) -> str:
+def _colorize_into(ndvi: np.ndarray, out: np.ndarray) -> None:
+    """
+    Colour NDVI by health class into the (rows, cols, 3) uint8 ``out``,
+    which ndvi_to_rgb fills a window of rows at a time.
+    """
+    # Class of every pixel, 0=Critical, 1=Severe, 2=Moderate, 3=Healthy (a
+    # value on a threshold falls in the lower class), coloured by one gather
+    # from the palette instead of a masked store per class. take() along the
+    # palette rows is several times faster than fancy indexing here.
+    classes = (ndvi > config.NDVI_SEVERE).view(np.uint8)
+    classes += ndvi > config.NDVI_MODERATE
+    classes += ndvi > config.NDVI_HEALTHY
+    _CLASS_PALETTE.take(classes, axis=0, out=out)
+
+    # Moderate stress shades from yellow-orange towards green. The pixels are
+    # located once and their colours written as whole rows, rather than
+    # three boolean-masked stores over the full image (one per channel).
+    moderate = np.flatnonzero(classes == 2)
+    t = (ndvi.ravel()[moderate] - config.NDVI_MODERATE) / (
+        config.NDVI_HEALTHY - config.NDVI_MODERATE + 1e-8
+    )
+    # Each channel is a * (1 - t) + b * t, evaluated in place in one
+    # channel-major buffer with 1 - t shared, then clipped and cast once
+    u = 1 - t
+    tb = np.empty_like(t)
+    shades = np.empty((3, moderate.size), dtype=t.dtype)
+    for channel, (a, b) in zip(shades, _MODERATE_GRADIENT):
+        np.multiply(u, a, out=channel)
+        channel += np.multiply(t, b, out=tb)
+    np.clip(shades, 0, 255, out=shades)
+    out.reshape(-1, 3)[moderate] = shades.T.astype(np.uint8)
+
+    # NaN compares false against every threshold; leave it uncoloured
+    nan = np.isnan(ndvi)
+    if nan.any():
+        out[nan] = 0
+
+
+def ndvi_to_rgb(ndvi_path: str, output_path: str = None, array: np.ndarray = None) -> str:
     """
     Convert NDVI GeoTIFF to a color-mapped RGB image for visualization.
     Uses a Red-Yellow-Green gradient matching health classification thresholds.
+    Pass the band as ``array`` (e.g. from ``calculate_ndvi(return_array=True)``)
+    to colour it without reading ``ndvi_path``.
     """
     import rasterio
     from PIL import Image
+    from rasterio.windows import Window
 
     ndvi_path = Path(ndvi_path)
     if output_path is None:
         output_path = config.PROCESSED_DIR / f"ndvi_rgb_{ndvi_path.stem}.png"
     output_path = Path(output_path)
 
-    with rasterio.open(str(ndvi_path)) as src:
-        ndvi = src.read(1)
-
-    # Define colormap: Critical → Severe → Moderate → Healthy
-    height, width = ndvi.shape
-    rgb = np.zeros((height, width, 3), dtype=np.uint8)
-
-    # Critical (purple)
-    mask = ndvi <= config.NDVI_SEVERE
-    rgb[mask] = [142, 68, 173]
-
-    # Severe stress (red-orange)
-    mask = (ndvi > config.NDVI_SEVERE) & (ndvi <= config.NDVI_MODERATE)
-    rgb[mask] = [231, 76, 60]
-
-    # Moderate stress (yellow-orange)
-    mask = (ndvi > config.NDVI_MODERATE) & (ndvi <= config.NDVI_HEALTHY)
-    t = (ndvi[mask] - config.NDVI_MODERATE) / (config.NDVI_HEALTHY - config.NDVI_MODERATE + 1e-8)
-    rgb[mask, 0] = (243 * (1 - t) + 46 * t).clip(0, 255).astype(np.uint8)
-    rgb[mask, 1] = (156 * (1 - t) + 204 * t).clip(0, 255).astype(np.uint8)
-    rgb[mask, 2] = (18 * (1 - t) + 113 * t).clip(0, 255).astype(np.uint8)
-
-    # Healthy (green)
-    mask = ndvi > config.NDVI_HEALTHY
-    rgb[mask] = [46, 204, 113]
+    # Colour a band of rows at a time, as calculate_ndvi computes them, so
+    # the RGB output is the only full-scene array
+    if array is not None:
+        rgb = np.empty(array.shape + (3,), dtype=np.uint8)
+        for row in range(0, array.shape[0], _WINDOW_ROWS):
+            _colorize_into(array[row:row + _WINDOW_ROWS], out=rgb[row:row + _WINDOW_ROWS])
+    else:
+        with rasterio.open(ndvi_path) as src:
+            rgb = np.empty((src.height, src.width, 3), dtype=np.uint8)
+            for row in range(0, src.height, _WINDOW_ROWS):
+                window = Window(0, row, src.width, min(_WINDOW_ROWS, src.height - row))
+                tile = src.read(1, window=window, out_dtype="float32")
+                _colorize_into(tile, out=rgb[row:row + window.height])
 
     img = Image.fromarray(rgb)
-    img.save(str(output_path))
+    img.save(output_path, compress_level=config.PNG_COMPRESS_LEVEL)
     logger.info(f"NDVI RGB saved: {output_path}")
     return str(output_path)
 
 
 def get_ndvi_array(ndvi_path: str) -> np.ndarray:
-    """Load NDVI values as a numpy array."""
+    """Load NDVI values as a float32 numpy array."""
     import rasterio
-    with rasterio.open(str(ndvi_path)) as src:
-        return src.read(1)
+    with rasterio.open(ndvi_path) as src:
+        return src.read(1, out_dtype="float32")
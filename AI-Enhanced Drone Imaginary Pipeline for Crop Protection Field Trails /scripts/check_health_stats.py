@@ -0,0 +1,86 @@
+"""
+Health Statistics Check
+========================
+Classifies synthetic NDVI tiles with classify_health_array and checks the
+pixel counts and NDVI moments against a direct computation over the valid
+pixels (``ndvi[ndvi > -9999]``), for tiles with -9999 nodata, NaN nodata,
+values on the class thresholds and no valid pixels at all. Exits non-zero
+on a mismatch.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def _reference(ndvi: np.ndarray) -> dict:
+    """Counts and moments from the compacted valid pixels."""
+    valid = ndvi[ndvi > -9999]
+    counts = {
+        "healthy": int((valid > config.NDVI_HEALTHY).sum()),
+        "moderate_stress": int(((valid > config.NDVI_MODERATE)
+                                & (valid <= config.NDVI_HEALTHY)).sum()),
+        "severe_stress": int(((valid > config.NDVI_SEVERE)
+                              & (valid <= config.NDVI_MODERATE)).sum()),
+        "critical": int((valid <= config.NDVI_SEVERE).sum()),
+        "total": int(valid.size),
+    }
+    if not valid.size:
+        return {"counts": counts, "ndvi": (0.0, 0.0, 0.0, 0.0)}
+    return {
+        "counts": counts,
+        "ndvi": (float(valid.mean(dtype=np.float64)), float(valid.std(dtype=np.float64)),
+                 float(valid.min()), float(valid.max())),
+    }
+
+
+def _tiles() -> dict:
+    """Named synthetic tiles covering the nodata and threshold cases."""
+    rng = np.random.default_rng(7)
+    base = rng.uniform(-0.2, 0.9, (64, 64)).astype(np.float32)
+    nodata = base.copy()
+    nodata[:8] = -9999
+    nan_rows = base.copy()
+    nan_rows[:32] = np.nan
+    mixed = nodata.copy()
+    mixed[:, :4] = np.nan
+    edges = base.copy()
+    edges[0, :3] = [config.NDVI_SEVERE, config.NDVI_MODERATE, config.NDVI_HEALTHY]
+    return {
+        "clean": base,
+        "-9999 rows": nodata,
+        "NaN rows": nan_rows,
+        "-9999 and NaN": mixed,
+        "on thresholds": edges,
+        "all NaN": np.full((16, 16), np.nan, dtype=np.float32),
+    }
+
+
+def check_health_stats() -> bool:
+    """Compare classify_health_array with the reference on every tile."""
+    from ai_models.health_classifier import classify_health_array
+
+    ok = True
+    for name, ndvi in _tiles().items():
+        result = classify_health_array(ndvi)
+        expected = _reference(ndvi)
+        overall = result["overall_ndvi"]
+        got = (overall["mean"], overall["std"], overall["min"], overall["max"])
+        same = result["pixel_counts"] == expected["counts"] and np.allclose(
+            got, expected["ndvi"], rtol=1e-6, atol=1e-7
+        )
+        logger.info(f"{'✅' if same else '❌'} {name}: {result['pixel_counts']} {got}")
+        ok &= same
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_health_stats() else 1)
@@ -0,0 +1,71 @@
+"""
+Segmentation Scale Check
+=========================
+Segments a synthetic NDVI raster with a nodata border at full resolution
+and at config.SEGMENTATION_SCALE, and checks both find the same plots:
+same count, bounding boxes within one block of each other, similar areas
+and no nodata in the plot statistics. Exits non-zero on a mismatch.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def _synthetic_ndvi(size: int = 128, border: int = 3, plot: int = 50) -> np.ndarray:
+    """Bare soil with a healthy plot in each corner, framed by nodata."""
+    rng = np.random.default_rng(42)
+    ndvi = (0.05 + rng.normal(0, 0.01, (size, size))).astype(np.float32)
+    far = size - plot
+    for row, col in [(0, 0), (0, far), (far, 0), (far, far)]:
+        ndvi[row:row + plot, col:col + plot] = 0.7
+    ndvi[:border, :] = ndvi[size - border:, :] = -9999
+    ndvi[:, :border] = ndvi[:, size - border:] = -9999
+    return ndvi
+
+
+def _plot_boxes(result: dict) -> list:
+    """(centroid row, centroid col, area, min NDVI) per plot, in a stable order."""
+    return sorted(
+        (p["centroid_pixel"]["row"], p["centroid_pixel"]["col"], p["area_pixels"],
+         p["ndvi_stats"]["min"])
+        for p in result["plots"]
+    )
+
+
+def check_scale(scale: int = None) -> bool:
+    """Compare scale 1 and ``scale`` segmentations for odd and even nodata borders."""
+    from rasterio.transform import from_origin
+
+    from ai_models.segmentation import segment_plots_array
+
+    scale = max(2, scale or config.SEGMENTATION_SCALE)
+    transform = from_origin(0, 0, 10, 10)
+    ok = True
+    for border in (2, 3):
+        ndvi = _synthetic_ndvi(border=border)
+        full, coarse = (
+            _plot_boxes(segment_plots_array(ndvi, transform, "EPSG:32615", scale=s))
+            for s in (1, scale)
+        )
+        same = len(full) == len(coarse) == 4 and all(
+            abs(r1 - r2) <= scale and abs(c1 - c2) <= scale
+            and abs(a1 - a2) <= 0.05 * a1 and m1 > -9999 and m2 > -9999
+            for (r1, c1, a1, m1), (r2, c2, a2, m2) in zip(full, coarse)
+        )
+        logger.info(f"{'✅' if same else '❌'} border={border}px: "
+                    f"scale 1 {full} vs scale {scale} {coarse}")
+        ok &= same
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_scale() else 1)
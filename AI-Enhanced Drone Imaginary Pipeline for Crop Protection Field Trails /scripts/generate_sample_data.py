@@ -5,14 +5,15 @@ Creates synthetic satellite imagery, weather data, and populates the database
 for a complete working demo without any API keys.
 """
 
-import json
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import numpy as np
+import orjson
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -37,73 +38,100 @@ def generate_all():
     logger.info("\n📡 Step 1/5: Generating Sentinel-2 satellite imagery...")
     from data_ingestion.sentinel_fetcher import fetch_sentinel_imagery
 
-    imagery_records = []
+    imagery = []
     for i in range(5):
         seed = 42 + i * 100
         metadata = fetch_sentinel_imagery()
-        img_id = db.insert_imagery(metadata)
-        imagery_records.append({"id": img_id, "metadata": metadata})
+        imagery.append(metadata)
         logger.info(f"  ✅ Image {i+1}/5 generated: {metadata['file_path']}")
+    # Each step's rows go in as one transaction
+    imagery_records = [
+        {"id": img_id, "metadata": metadata}
+        for img_id, metadata in zip(db.insert_many_imagery(imagery), imagery)
+    ]
 
     # Step 2: Calculate NDVI for each image
     logger.info("\n🌿 Step 2/5: Computing NDVI indices...")
     from processing.ndvi_calculator import calculate_ndvi, ndvi_to_rgb
 
-    ndvi_records = []
-    for rec in imagery_records:
-        result = calculate_ndvi(rec["metadata"]["file_path"])
-        ndvi_id = db.insert_ndvi_result(rec["id"], result)
-        ndvi_records.append({"id": ndvi_id, "result": result})
-        # Also create RGB visualization
-        ndvi_to_rgb(result["output_file"])
-        logger.info(
-            f"  ✅ NDVI computed: mean={result['statistics']['mean']:.3f}, "
-            f"healthy={result['statistics']['healthy_pct']:.1f}%"
-        )
+    # Images generated within the same second share a file (the name carries
+    # a one-second timestamp), so each distinct file is processed once. The
+    # files are independent, so their NDVI and preview images run on a pool;
+    # rasterio, NumPy and PIL's PNG encoder release the GIL for the heavy
+    # work. Database writes stay on this thread, in image order.
+    image_paths = list(dict.fromkeys(rec["metadata"]["file_path"] for rec in imagery_records))
+    with ThreadPoolExecutor() as pool:
+        # Each NDVI band is kept in memory for its preview and classification
+        ndvi_futures = {
+            pool.submit(calculate_ndvi, path, return_array=True): path for path in image_paths
+        }
+        # Also create RGB visualizations, each queued as soon as its NDVI is
+        # done so the PNG encoding overlaps the NDVI of the other images
+        results, previews = {}, []
+        for future in as_completed(ndvi_futures):
+            r = results[ndvi_futures[future]] = future.result()
+            previews.append(pool.submit(ndvi_to_rgb, r["output_file"], array=r["array"]))
+        ndvi_pairs = [
+            (rec["id"], results[rec["metadata"]["file_path"]]) for rec in imagery_records
+        ]
+        ndvi_records = []
+        for ndvi_id, (_, result) in zip(db.insert_many_ndvi_results(ndvi_pairs), ndvi_pairs):
+            ndvi_records.append({"id": ndvi_id, "result": result})
+            logger.info(
+                f"  ✅ NDVI computed: mean={result['statistics']['mean']:.3f}, "
+                f"healthy={result['statistics']['healthy_pct']:.1f}%"
+            )
+        for preview in previews:
+            preview.result()
 
     # Step 3: Create visual composites
     logger.info("\n🎨 Step 3/5: Creating visual composites...")
-    from processing.geo_processor import create_rgb_composite, create_false_color_composite
+    from processing.geo_processor import create_composites
 
     latest_img = imagery_records[-1]["metadata"]["file_path"]
-    rgb_path = create_rgb_composite(latest_img)
-    fc_path = create_false_color_composite(latest_img)
+    rgb_path, fc_path = create_composites(latest_img)
     logger.info(f"  ✅ RGB composite: {rgb_path}")
     logger.info(f"  ✅ False-color composite: {fc_path}")
 
     # Step 4: Run health classification and segmentation
     logger.info("\n🔬 Step 4/5: Running AI health classification & segmentation...")
-    from ai_models.health_classifier import classify_health
+    from ai_models.health_classifier import classify_health_array
     from ai_models.segmentation import segment_plots, plots_to_geojson
 
-    for ndvi_rec in ndvi_records:
-        # Classify health
-        classification = classify_health(ndvi_rec["result"]["output_file"])
-        db.insert_health_assessment(ndvi_rec["id"], classification)
-        logger.info(
-            f"  ✅ Health: {classification['overall_health']} | "
-            f"Healthy: {classification['percentages']['healthy']:.0f}% | "
-            f"Stressed: {classification['percentages']['moderate_stress']:.0f}%"
+    assessments = []
+    with ThreadPoolExecutor() as pool:
+        # Segment the latest image alongside the classifications
+        segmentation_future = pool.submit(
+            segment_plots, ndvi_records[-1]["result"]["output_file"]
         )
-
-    # Segment the latest image
-    latest_ndvi = ndvi_records[-1]["result"]["output_file"]
-    segmentation = segment_plots(latest_ndvi)
+        classifications = {
+            r["output_file"]: pool.submit(
+                classify_health_array, r["array"], source_file=r["output_file"]
+            )
+            for r in results.values()
+        }
+        for ndvi_rec in ndvi_records:
+            classification = classifications[ndvi_rec["result"]["output_file"]].result()
+            assessments.append((ndvi_rec["id"], classification))
+            logger.info(
+                f"  ✅ Health: {classification['overall_health']} | "
+                f"Healthy: {classification['percentages']['healthy']:.0f}% | "
+                f"Stressed: {classification['percentages']['moderate_stress']:.0f}%"
+            )
+        segmentation = segmentation_future.result()
+    db.insert_many_health_assessments(assessments)
     geojson = plots_to_geojson(segmentation)
 
     # Save GeoJSON
     geojson_path = config.PROCESSED_DIR / "plots.geojson"
-    with open(geojson_path, "w") as f:
-        json.dump(geojson, f, indent=2)
+    geojson_path.write_bytes(orjson.dumps(geojson, option=orjson.OPT_SERIALIZE_NUMPY))
     logger.info(f"  ✅ Segmented {segmentation['total_plots']} plots → {geojson_path}")
 
     # Step 5: Generate weather history
     logger.info("\n🌤️  Step 5/5: Generating weather time series...")
     from data_ingestion.weather_fetcher import fetch_weather
 
-    for i in range(24):
-        weather = fetch_weather(save=True)
-        db.insert_weather(weather)
+    db.insert_many_weather([fetch_weather(save=True) for _ in range(24)])
 
     logger.info(f"  ✅ Generated 24 weather records")
 
@@ -116,6 +144,7 @@ def generate_all():
         processing_time=elapsed,
         steps="ingest,ndvi,composite,classify,segment,weather",
     )
+    db.close()
 
     # Summary
     logger.info("\n" + "=" * 60)
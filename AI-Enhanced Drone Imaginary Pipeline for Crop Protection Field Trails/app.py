@@ -179,6 +179,8 @@ with st.sidebar:
         with st.spinner("Running pipeline..."):
             from data_ingestion.pipeline_scheduler import run_pipeline
             result = run_pipeline()
+            # New rows and output files: drop cached queries and map layers
+            st.cache_data.clear()
             if result["status"] == "completed":
                 st.success(f"✅ Complete in {result['processing_time_s']}s")
             else:
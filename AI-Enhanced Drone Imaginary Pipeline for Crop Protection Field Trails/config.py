@@ -19,9 +19,10 @@ WEATHER_DIR = DATA_DIR / "weather"
 TILES_DIR = DATA_DIR / "tiles"
 DB_PATH = DATA_DIR / "pipeline.db"
 MODELS_DIR = PROJECT_ROOT / "models"
+STATIC_DIR = PROJECT_ROOT / "static"  # Served by Streamlit at /app/static
 
 # Create directories
-for d in [RAW_DIR, PROCESSED_DIR, WEATHER_DIR, TILES_DIR, MODELS_DIR]:
+for d in [RAW_DIR, PROCESSED_DIR, WEATHER_DIR, TILES_DIR, MODELS_DIR, STATIC_DIR]:
     d.mkdir(parents=True, exist_ok=True)
 
 # ── API Keys ─────────────────────────────────────────────────
@@ -63,6 +64,8 @@ AUTO_REFRESH_SECONDS = int(os.getenv("AUTO_REFRESH_SECONDS", "300"))
 CRS_TARGET = "EPSG:4326"
 SENTINEL_BANDS = {"B02": "Blue", "B03": "Green", "B04": "Red", "B08": "NIR"}
 IMAGE_SIZE_PX = 512  # Default output image dimension
+SEGMENTATION_SCALE = int(os.getenv("SEGMENTATION_SCALE", "2"))  # NDVI downsample factor for plot segmentation
+PNG_COMPRESS_LEVEL = int(os.getenv("PNG_COMPRESS_LEVEL", "1"))  # zlib level (0-9) for preview/composite PNGs
 
 # ── Sentinel-2 Defaults ─────────────────────────────────────
 SENTINEL_RESOLUTION = 10  # meters per pixel